@@ -3,7 +3,19 @@ from e2b_code_interpreter import Sandbox
 from anthropic import Anthropic
 import ast
 import argparse
-import PyPDF2 
+import contextlib
+import functools
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_cache import cached_completion, lookup_completion, store_completion
+from pdf_context import DEFAULT_CONTEXT_TOKENS, get_pdf_context
+from program_stream import StreamingProgramParser
+from render_backends import ManimGLBackend, SandboxBackend
+from render_scheduler import RenderScheduler
+from sandbox_pool import LocalSandbox, SandboxPool
 
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 E2B_API_KEY = os.getenv("E2B_API_KEY")
@@ -32,20 +44,135 @@ class SquareToCircle(Scene):
 ```
 """
 
-def ask_claude(system_prompt, user_message, api_key, model_name):
+# Used with the manimgl backend, which renders with the vendored ManimGL
+# (manimlib) rather than Community manim
+MANIMGL_SYSTEM_PROMPT = """
+You are an expert level ManimGL (the Manim library that 3B1B uses, imported as manimlib) expert. 
+Return only code without any explanation. DO NOT ADD ANY TEXT TO THE ANIMATION.
+
+Here are examples of scenes:
+Square to circle animation:
+```
+from manimlib import *
+
+class SquareToCircle(Scene):
+    def construct(self):
+        circle = Circle()
+        square = Square()
+        square.flip(RIGHT)
+        square.rotate(-3 * TAU / 8)
+        circle.set_fill(PINK, opacity=0.5)
+
+        self.play(ShowCreation(square))
+        self.play(Transform(square, circle))
+        self.play(FadeOut(square))
+```
+"""
+
+REPAIR_PROMPT = """
+The Manim program below failed to render. Here is the program:
+```
+{program}
+```
+
+These scenes failed, with the following errors:
+{errors}
+
+Fix the errors, keeping the animations otherwise the same. Return the complete corrected program.
+"""
+
+# Keep only the end of long error output, which is where the traceback ends
+MAX_ERROR_CHARS = 3000
+
+
+def ask_claude(system_prompt, user_message, api_key, model_name, use_cache=True, refresh_cache=False):
     client = Anthropic(api_key=api_key)
     
     print(f"\n{'='*50}\nUser Message: {user_message}\n{'='*50}")
 
-    message = client.messages.create(
+    return cached_completion(
+        client.messages.create,
         model=model_name,
         system=system_prompt,
         max_tokens=20096,
         messages=[{"role": "user", "content": user_message}],
-        # tools=tools,
+        use_cache=use_cache,
+        refresh=refresh_cache,
     )
-    
-    return message.content[0].text
+
+def ask_claude_streaming(system_prompt, user_message, api_key, model_name, on_class,
+                         use_cache=True, refresh_cache=False):
+    """
+    Like ask_claude, but streams the response, and calls on_class with each
+    top-level class of the program as soon as its definition is complete.
+
+    Args:
+        on_class (callable): Called with a CompletedClass, which holds
+            the class name, whether it is a scene, the program up to that
+            class, and any syntax error found in it.
+
+    Returns:
+        str: The full program, without markdown code fences.
+    """
+    print(f"\n{'='*50}\nUser Message: {user_message}\n{'='*50}")
+
+    max_tokens = 20096
+    messages = [{"role": "user", "content": user_message}]
+    parser = StreamingProgramParser()
+
+    def consume(text):
+        for completed in parser.feed(text):
+            on_class(completed)
+
+    response = None
+    if use_cache and not refresh_cache:
+        response = lookup_completion(model_name, messages, max_tokens, system_prompt)
+    if response is not None:
+        print("Using cached LLM response.")
+        consume(response)
+    else:
+        client = Anthropic(api_key=api_key)
+        chunks = []
+        with client.messages.stream(
+            model=model_name,
+            system=system_prompt,
+            max_tokens=max_tokens,
+            messages=messages,
+        ) as stream:
+            for text in stream.text_stream:
+                chunks.append(text)
+                consume(text)
+        if use_cache:
+            store_completion("".join(chunks), model_name, messages, max_tokens, system_prompt)
+
+    for completed in parser.finish():
+        on_class(completed)
+    return parser.get_program()
+
+def repair_program(program, errors, api_key, model_name, use_cache=True, refresh_cache=False,
+                   system_prompt=SYSTEM_PROMPT):
+    """
+    Ask the LLM to fix a program, given the errors its scenes failed with.
+
+    Args:
+        program (str): The program that failed.
+        errors (dict): Maps the names of the failed scenes to their error output.
+        refresh_cache (bool): Ask the LLM again even if the same repair is
+            cached, storing the new response.
+
+    Returns:
+        str: The corrected program.
+    """
+    error_text = "\n\n".join(
+        f"{scene_name}:\n{error[-MAX_ERROR_CHARS:]}"
+        for scene_name, error in errors.items()
+    )
+    message = REPAIR_PROMPT.format(program=program, errors=error_text)
+    response = ask_claude(
+        system_prompt, message, api_key, model_name,
+        use_cache=use_cache, refresh_cache=refresh_cache,
+    )
+    return postprocess_program(response)
 
 def initialize_box(template=None):
 
@@ -60,15 +187,18 @@ def initialize_box(template=None):
 
     return sbx
 
-def generate_video(sbx, code: str, scene_name: str):
+def generate_video(sbx, code: str, scene_name: str, output_path: str = "Animation.mp4"):
+    code_name = os.path.basename(code)
     with open(code, "r") as file:
-        sbx.files.write(f"/home/user/{code.split('/')[-1]}", file)
+        sbx.files.write(f"/home/user/{code_name}", file)
 
-    sbx.commands.run(f"manim /home/user/code.py {scene_name}", timeout=600)
+    sbx.commands.run(f"manim /home/user/{code_name} {scene_name}", timeout=600)
 
-    content = sbx.files.read(f'/home/user/media/videos/code/1080p60/{scene_name}.mp4', format='bytes')
-    with open("Animation.mp4", "wb") as file:
+    module_name = os.path.splitext(code_name)[0]
+    content = sbx.files.read(f'/home/user/media/videos/{module_name}/1080p60/{scene_name}.mp4', format='bytes')
+    with open(output_path, "wb") as file:
         file.write(content)
+    return output_path
 
 def postprocess_program(program: str):
     program = program.replace("```", "")
@@ -89,71 +219,299 @@ def get_class_names(program_code):
     tree = ast.parse(program_code)
     return [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
 
-def process_pdf_document(pdf_path):
+def process_pdf_document(pdf_path, query=None, max_tokens=DEFAULT_CONTEXT_TOKENS, top_k=None):
     """
     Process a PDF document to extract text that can be used as context.
     
     Args:
         pdf_path (str): Path to the PDF file
+        query (str, optional): The animation request, used to retrieve only
+            the most relevant passages of the PDF
+        max_tokens (int): Approximate token budget for the extracted text
+        top_k (int, optional): Maximum number of passages to retrieve
         
     Returns:
         str: Extracted text from the PDF
     """
-    text = ""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            num_pages = len(reader.pages)
-            print(f"Processing PDF with {num_pages} pages")
-            
-            # Extract text from each page
-            for page_num in range(num_pages):
-                page = reader.pages[page_num]
-                text += page.extract_text() + "\n\n"
-            
-            # Truncate if too long (to avoid exceeding token limits)
-            if len(text) > 50000:
-                text = text[:50000] + "... [PDF content truncated due to length]"
-                
-            print(f"Extracted {len(text)} characters from PDF")
-            return text
+        text = get_pdf_context(pdf_path, query=query, max_tokens=max_tokens, top_k=top_k)
+        print(f"Extracted {len(text)} characters from PDF")
+        return text
     except Exception as e:
         print(f"Error processing PDF: {e}")
 
-if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description="Generate Manim animations from text descriptions")
-    parser.add_argument("--query", required=True, help="Description of the animation to generate")
-    parser.add_argument("--pdf", help="Path to a PDF document to use as context")
-    parser.add_argument("--output-dir", default="output", help="Directory to save the generated animations")
-    args = parser.parse_args()
+def run_job(query, pdf, output_dir, program_path, backend, args, llm_slots=None):
+    """
+    Generate the program for one animation request, render all of its scenes
+    on the render backend, and repair scenes which fail.
+
+    Args:
+        query (str): Description of the animation to generate.
+        pdf (str, optional): Path to a PDF document to use as context.
+        output_dir (str): Directory the videos are saved to.
+        program_path (str): Where the generated program is saved.
+        backend (RenderBackend): Renders the scenes.
+        args (argparse.Namespace): Command line options.
+        llm_slots (optional): Context manager held during each LLM call, e.g. a
+            semaphore limiting how many requests are made at once.
 
-    print("Initializing E2B box...")
-    sbx = initialize_box("2ulazwy6l44ghm46535z")
-    print("Finished initializing E2B box.\n")
+    Returns:
+        tuple of (dict, dict): Video paths of the rendered scenes, and errors
+            of the scenes which still failed, both by scene name.
 
-    user_prompt = args.query
+    With args.draft, scenes are rendered as quick drafts while the program
+    is generated and repaired, into output_dir/drafts, and the scenes whose
+    drafts rendered are then rendered again at full quality.
+    """
+    llm_slots = llm_slots or contextlib.nullcontext()
+    system_prompt = MANIMGL_SYSTEM_PROMPT if args.backend == "manimgl" else SYSTEM_PROMPT
+    user_prompt = query
 
-    if args.pdf:
-        print(f"Processing PDF document: {args.pdf}")
-        pdf_context = process_pdf_document(args.pdf)
+    if pdf:
+        print(f"Processing PDF document: {pdf}")
+        pdf_context = process_pdf_document(
+            pdf, query=query, max_tokens=args.context_tokens, top_k=args.top_k,
+        )
         user_prompt += f"Context PDF of the attached PDF:\n {pdf_context}"
-        
+    
         print(f"PDF processing complete.")
 
+    # Scenes render concurrently, up to the backend's size, and each video
+    # is saved as soon as its render finishes
+    if args.draft:
+        scheduler = RenderScheduler(backend.with_args("--draft"), os.path.join(output_dir, "drafts"))
+    else:
+        scheduler = RenderScheduler(backend, output_dir)
+    # Errors found before anything is rendered, by scene name
+    syntax_errors = {}
+    # Program each scene was last rendered from
+    code_paths = {}
+
+    def submit(code_path, scene_name):
+        code_paths[scene_name] = code_path
+        scheduler.submit(code_path, scene_name)
+
     print("Sending LLM call...")
-    program = ask_claude(SYSTEM_PROMPT, user_prompt, ANTHROPIC_API_KEY, MODEL_NAME)
-    program = postprocess_program(program)    
-    print("Received response from LLM.\n")
+    if args.stream:
+        # Each scene is rendered from the program up to its class, as soon
+        # as that class has arrived, while the rest is still streaming in
+        programs_dir = os.path.join(output_dir, "programs")
+        os.makedirs(programs_dir, exist_ok=True)
 
-    generated_program_filename = "code.py"
-    
+        def on_class(completed):
+            if completed.error is not None:
+                print(f"Class {completed.name} has a syntax error, skipping it: {completed.error}")
+                syntax_errors[completed.name] = f"SyntaxError: {completed.error}"
+            elif completed.is_scene:
+                code_path = os.path.join(programs_dir, f"{completed.name}.py")
+                with open(code_path, "w") as file:
+                    file.write(completed.program)
+                print(f"Scene {completed.name} is complete, rendering it...")
+                submit(code_path, completed.name)
+
+        with llm_slots:
+            program = ask_claude_streaming(
+                system_prompt, user_prompt, ANTHROPIC_API_KEY, MODEL_NAME, on_class,
+                use_cache=not args.no_cache, refresh_cache=args.refresh_cache,
+            )
+    else:
+        with llm_slots:
+            program = ask_claude(
+                system_prompt, user_prompt, ANTHROPIC_API_KEY, MODEL_NAME,
+                use_cache=not args.no_cache, refresh_cache=args.refresh_cache,
+            )
+        program = postprocess_program(program)    
+    print("Received response from LLM.\n")
 
-    with open(generated_program_filename, "w") as file:
+    os.makedirs(os.path.dirname(os.path.abspath(program_path)), exist_ok=True)
+    with open(program_path, "w") as file:
         print(f"Generated program: {program}")
         file.write(program)
 
-    print(f"Saved program with scenes to {generated_program_filename}.")
+    print(f"Saved program with scenes to {program_path}.")
 
-    for class_name in get_class_names(program):
-        print(f"Processing {class_name} scene...")
-        generate_video(sbx, generated_program_filename, class_name)
\ No newline at end of file
+    if not args.stream:
+        try:
+            scene_names = get_class_names(program)
+        except SyntaxError as e:
+            scene_names = []
+            syntax_errors["program"] = f"SyntaxError: {e}"
+        print(f"Rendering {len(scene_names)} scenes, {backend.size} at a time...")
+        for scene_name in scene_names:
+            submit(program_path, scene_name)
+
+    # Failed scenes are sent back to the LLM together with their errors,
+    # and re-rendered from the corrected program. Scenes which already
+    # rendered successfully are kept as they are.
+    rendered = {}
+    for attempt in range(args.max_repairs + 1):
+        if attempt > 0:
+            print(f"Repairing {len(failures)} failed scenes (attempt {attempt}/{args.max_repairs})...")
+            with llm_slots:
+                # A cached repair is only used on the first attempt. Had it
+                # failed before, later attempts would otherwise be served the
+                # same cached repairs, so they always ask the LLM again
+                program = repair_program(
+                    program, failures, ANTHROPIC_API_KEY, MODEL_NAME,
+                    use_cache=not args.no_cache,
+                    refresh_cache=args.refresh_cache or attempt > 1,
+                    system_prompt=system_prompt,
+                )
+            with open(program_path, "w") as file:
+                file.write(program)
+            try:
+                scene_names = get_class_names(program)
+            except SyntaxError as e:
+                print(f"Repaired program has a syntax error: {e}")
+                failures = {name: f"SyntaxError: {e}" for name in failures}
+                continue
+            for scene_name in scene_names:
+                if scene_name not in rendered:
+                    submit(program_path, scene_name)
+
+        failures = syntax_errors if attempt == 0 else {}
+        for result in scheduler.results():
+            if result.error is None:
+                print(f"Scene {result.scene_name} saved to {result.video_path}")
+                rendered[result.scene_name] = result.video_path
+            else:
+                print(f"Scene {result.scene_name} failed:\n{result.error}")
+                failures[result.scene_name] = result.error
+        if not failures:
+            break
+    scheduler.shutdown()
+
+    if failures:
+        print(f"{len(failures)} scenes still failed after {args.max_repairs} repair attempts: {', '.join(failures)}")
+
+    if args.draft and rendered:
+        print(f"Rendering {len(rendered)} working scenes at full quality...")
+        drafts, rendered = rendered, {}
+        with RenderScheduler(backend, output_dir) as final_scheduler:
+            for scene_name in drafts:
+                final_scheduler.submit(code_paths[scene_name], scene_name)
+            for result in final_scheduler.results():
+                if result.error is None:
+                    print(f"Scene {result.scene_name} saved to {result.video_path}")
+                    rendered[result.scene_name] = result.video_path
+                else:
+                    print(f"Scene {result.scene_name} failed at full quality:\n{result.error}")
+                    failures[result.scene_name] = result.error
+    return rendered, failures
+
+def load_batch_results(results_path):
+    """Return the recorded results of a previous run of a batch, by job key."""
+    results = {}
+    if os.path.exists(results_path):
+        with open(results_path, "r") as file:
+            for line in file:
+                if line.strip():
+                    result = json.loads(line)
+                    results[result["key"]] = result
+    return results
+
+def get_job_key(job):
+    return hashlib.sha256(json.dumps(job, sort_keys=True).encode("utf-8")).hexdigest()
+
+def run_batch(batch_path, backend, args):
+    """
+    Run every job in a JSONL file, with one {"query", "pdf", "output"} object
+    per line. Jobs run concurrently and share the render backend, and at
+    most args.llm_concurrency LLM requests are made at once.
+
+    Each finished job is appended to a results manifest next to the batch
+    file. Jobs already recorded there are skipped, so an interrupted batch
+    resumes where it stopped; jobs which raised an error are retried.
+    """
+    with open(batch_path, "r") as file:
+        jobs = [json.loads(line) for line in file if line.strip()]
+
+    results_path = os.path.splitext(batch_path)[0] + "_results.jsonl"
+    previous_results = load_batch_results(results_path)
+    results_lock = threading.Lock()
+    llm_slots = threading.BoundedSemaphore(args.llm_concurrency)
+
+    def run(index, job):
+        key = get_job_key(job)
+        if previous_results.get(key, {}).get("status") in ("done", "partial"):
+            print(f"Job {index} already finished, skipping it.")
+            return
+        output_dir = job.get("output") or os.path.join(args.output_dir, f"job_{index:04d}")
+        result = {"key": key, "index": index, "job": job, "output": output_dir}
+        try:
+            rendered, failures = run_job(
+                job["query"], job.get("pdf"), output_dir, os.path.join(output_dir, "code.py"),
+                backend, args, llm_slots,
+            )
+            result.update(
+                status="partial" if failures else "done",
+                videos=rendered,
+                failed_scenes=sorted(failures),
+            )
+        except Exception as e:
+            print(f"Job {index} failed: {e}")
+            result.update(status="error", error=str(e))
+        with results_lock:
+            with open(results_path, "a") as file:
+                file.write(json.dumps(result) + "\n")
+
+    print(f"Running {len(jobs)} jobs from {batch_path}...")
+    with ThreadPoolExecutor(max_workers=args.batch_workers) as executor:
+        list(executor.map(run, range(len(jobs)), jobs))
+    print(f"Batch finished, results written to {results_path}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate Manim animations from text descriptions")
+    parser.add_argument("--query", help="Description of the animation to generate")
+    parser.add_argument("--batch", help="JSONL file with one {\"query\", \"pdf\", \"output\"} job per line")
+    parser.add_argument("--batch-workers", type=int, default=4, help="Number of batch jobs run at once")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Maximum number of LLM requests made at once in batch mode")
+    parser.add_argument("--pdf", help="Path to a PDF document to use as context")
+    parser.add_argument("--context-tokens", type=int, default=DEFAULT_CONTEXT_TOKENS, help="Approximate token budget for PDF context")
+    parser.add_argument("--top-k", type=int, help="Maximum number of PDF passages to retrieve for the query")
+    parser.add_argument("--output-dir", default="output", help="Directory to save the generated animations")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM, bypassing the response cache")
+    parser.add_argument("--refresh-cache", action="store_true", help="Call the LLM and overwrite any cached response")
+    parser.add_argument("--backend", choices=["e2b", "local", "manimgl"], default="e2b",
+                        help="Render on E2B sandboxes, with a locally installed manim, or with the ManimGL in this repository")
+    parser.add_argument("--pool-size", type=int, default=1, help="Number of sandboxes to keep warm, and scenes to render at once")
+    parser.add_argument("--max-renders-per-sandbox", type=int, default=20, help="Renders after which a sandbox is replaced")
+    parser.add_argument("--render-timeout", type=float, default=600, help="Seconds after which a manimgl render is killed")
+    parser.add_argument("--render-memory-mb", type=int, default=None, help="Address space limit of each manimgl render, off by default as some GL drivers reserve a lot of it")
+    parser.add_argument("--render-cpu-seconds", type=int, default=600, help="CPU time limit of each manimgl render, 0 for none")
+    parser.add_argument("--egl", action="store_true", help="With the manimgl backend, render on the GPU through EGL, which needs no display server")
+    parser.add_argument("--draft", action="store_true", help="With the manimgl backend, render quick drafts while generating and repairing, then render working scenes at full quality")
+    parser.add_argument("--max-repairs", type=int, default=2, help="How many times failed scenes are sent back to the LLM to be fixed")
+    parser.add_argument("--stream", action="store_true", help="Stream the LLM response and start rendering each scene as soon as it is complete")
+    args = parser.parse_args()
+    if not args.query and not args.batch:
+        parser.error("one of --query or --batch is required")
+    if args.draft and args.backend != "manimgl":
+        parser.error("--draft requires --backend manimgl")
+    if args.egl and args.backend != "manimgl":
+        parser.error("--egl requires --backend manimgl")
+
+    if args.backend == "manimgl":
+        backend = ManimGLBackend(
+            size=args.pool_size, timeout=args.render_timeout, max_memory_mb=args.render_memory_mb,
+            max_cpu_seconds=args.render_cpu_seconds,
+            extra_args=["--headless_backend", "egl"] if args.egl else (),
+        )
+    else:
+        # Sandboxes are provisioned in the background while the LLM is working
+        if args.backend == "local":
+            factory = LocalSandbox
+        else:
+            factory = functools.partial(initialize_box, "2ulazwy6l44ghm46535z")
+        pool = SandboxPool(factory, size=args.pool_size, max_renders_per_sandbox=args.max_renders_per_sandbox)
+        print("Initializing sandboxes in the background...")
+        pool.start()
+        backend = SandboxBackend(pool, generate_video)
+
+    try:
+        if args.batch:
+            run_batch(args.batch, backend, args)
+        else:
+            run_job(args.query, args.pdf, args.output_dir, "code.py", backend, args)
+    finally:
+        backend.close()
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+
+from diskcache import Cache
+
+# Where LLM responses are stored, and how large that store may grow before
+# the least recently used responses are evicted
+LLM_CACHE_DIR = os.getenv(
+    "LLM_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "tta_llm_responses"),
+)
+LLM_CACHE_SIZE = 5e8  # 500 MB
+
+_cache = None
+
+
+def get_cache():
+    """Open the on-disk cache lazily, so importing this module is free."""
+    global _cache
+    if _cache is None:
+        _cache = Cache(
+            LLM_CACHE_DIR,
+            size_limit=int(LLM_CACHE_SIZE),
+            eviction_policy="least-recently-used",
+        )
+    return _cache
+
+
+def get_cache_key(model, messages, max_tokens, system=None):
+    """
+    Content address of a request. Messages may hold base64 encoded PDFs, so
+    identical document bytes map to the same key.
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "system": system,
+            "messages": messages,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_completion(create, model, messages, max_tokens, system=None,
+                      use_cache=True, refresh=False):
+    """
+    Return the text of a messages.create call, serving it from disk when
+    an identical request has been made before.
+
+    Args:
+        create (callable): Function taking messages.create keyword arguments,
+            e.g. client.messages.create.
+        model (str): Model name.
+        messages (list): Messages to send.
+        max_tokens (int): Maximum tokens to generate.
+        system (str, optional): System prompt.
+        use_cache (bool): If False, bypass the cache entirely.
+        refresh (bool): If True, ignore any stored response, but store the new one.
+
+    Returns:
+        str: Text of the first content block of the response.
+    """
+    kwargs = dict(model=model, messages=messages, max_tokens=max_tokens)
+    if system is not None:
+        kwargs["system"] = system
+
+    if not use_cache:
+        return create(**kwargs).content[0].text
+
+    if not refresh:
+        text = lookup_completion(model, messages, max_tokens, system)
+        if text is not None:
+            print("Using cached LLM response.")
+            return text
+
+    text = create(**kwargs).content[0].text
+    store_completion(text, model, messages, max_tokens, system)
+    return text
+
+
+def lookup_completion(model, messages, max_tokens, system=None):
+    """Return the cached response text for a request, or None."""
+    return get_cache().get(get_cache_key(model, messages, max_tokens, system))
+
+
+def store_completion(text, model, messages, max_tokens, system=None):
+    """Store response text obtained outside of cached_completion, e.g. by streaming."""
+    get_cache().set(get_cache_key(model, messages, max_tokens, system), text)
+
+
+def clear_llm_cache():
+    get_cache().clear()
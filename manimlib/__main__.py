@@ -1,11 +1,15 @@
 #!/usr/bin/env python
+import os
+
 from addict import Dict
 
 from manimlib import __version__
 from manimlib.config import manim_config
 from manimlib.config import parse_cli
 import manimlib.extract_scene
+from manimlib.logger import log
 from manimlib.utils.cache import clear_cache
+from manimlib.utils.profiling import PROFILER
 from manimlib.window import Window
 
 
@@ -36,7 +40,11 @@ def run_scenes():
             # Blocking call since a scene may init an IPython shell()
             scenes = manimlib.extract_scene.main(scene_config, run_config)
             for scene in scenes:
+                if run_config.profile:
+                    PROFILER.enable()
                 scene.run()
+                if run_config.profile:
+                    write_profile(run_config.profile, scene, len(scenes))
             return
         except KillEmbedded:
             # Requested via the `exit_raise` IPython runline magic
@@ -46,6 +54,15 @@ def run_scenes():
             break
 
 
+def write_profile(profile: str, scene, n_scenes: int) -> None:
+    PROFILER.disable()
+    file_root = os.path.splitext(profile)[0]
+    if n_scenes > 1:
+        file_root += f"_{scene}"
+    report_path, trace_path = PROFILER.write_report(file_root)
+    log.info(f"Profile written to {report_path} and {trace_path}")
+
+
 def main():
     """
     Main entry point for ManimGL.
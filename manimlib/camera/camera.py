@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+from collections import deque
+
 import moderngl
 import numpy as np
 import OpenGL.GL as gl
 from PIL import Image
 
 from manimlib.camera.camera_frame import CameraFrame
+from manimlib.camera.context_pool import get_headless_context
+from manimlib.camera.context_pool import lease_framebuffer
+from manimlib.camera.context_pool import release_framebuffer
 from manimlib.constants import BLACK
 from manimlib.constants import DEFAULT_RESOLUTION
 from manimlib.constants import FRAME_HEIGHT
@@ -13,6 +18,8 @@ from manimlib.constants import FRAME_WIDTH
 from manimlib.mobject.mobject import Mobject
 from manimlib.mobject.mobject import Point
 from manimlib.utils.color import color_to_rgba
+from manimlib.utils.profiling import PROFILER
+from manimlib.utils.shaders import get_shader_program
 
 from typing import TYPE_CHECKING
 
@@ -44,6 +51,16 @@ class Camera(object):
         # without multisampling, for 3d scenes one might want
         # to set samples to be greater than 0.
         samples: int = 0,
+        # Frames written to files are read back from the GPU asynchronously
+        # through a ring of this many pixel buffers, so that reading frame n
+        # overlaps with rendering frame n + 1. Frames then reach the file
+        # writer readback_buffers - 1 frames late. Set to 1 to read back
+        # synchronously.
+        readback_buffers: int = 2,
+        # Backend for the standalone context used without a window, e.g. "egl"
+        # to render on a GPU with no display server. The context is shared by
+        # all cameras in the process, along with its programs and framebuffers.
+        headless_backend: Optional[str] = None,
     ):
         self.window = window
         self.background_image = background_image
@@ -55,6 +72,8 @@ class Camera(object):
         self.pixel_array_dtype = pixel_array_dtype
         self.light_source_position = light_source_position
         self.samples = samples
+        self.n_readback_buffers = readback_buffers
+        self.headless_backend = headless_backend
 
         self.rgb_max_val: float = np.iinfo(self.pixel_array_dtype).max
         self.background_rgba: list[float] = list(color_to_rgba(
@@ -64,6 +83,7 @@ class Camera(object):
         self.init_frame(**frame_config)
         self.init_context()
         self.init_fbo()
+        self.init_readback_buffers()
         self.init_light_source()
 
     def init_frame(self, **config) -> None:
@@ -71,7 +91,7 @@ class Camera(object):
 
     def init_context(self) -> None:
         if self.window is None:
-            self.ctx: moderngl.Context = moderngl.create_standalone_context()
+            self.ctx: moderngl.Context = get_headless_context(self.headless_backend)
         else:
             self.ctx: moderngl.Context = self.window.ctx
 
@@ -94,6 +114,18 @@ class Camera(object):
 
         self.fbo.use()
 
+    def init_readback_buffers(self) -> None:
+        width, height = self.default_pixel_shape
+        n_bytes = width * height * self.n_channels
+        self.readback_buffers = [
+            self.ctx.buffer(reserve=n_bytes)
+            for _ in range(self.n_readback_buffers if self.n_readback_buffers > 1 else 0)
+        ]
+        self.readback_index = 0
+        # Buffers holding frames in flight, with the number of bytes in each
+        self.pending_readbacks: deque[tuple[moderngl.Buffer, int]] = deque()
+        self.yuv_readback = False
+
     def init_light_source(self) -> None:
         self.light_source = Point(self.light_source_position)
 
@@ -109,16 +141,11 @@ class Camera(object):
         self,
         samples: int = 0
     ) -> moderngl.Framebuffer:
-        return self.ctx.framebuffer(
-            color_attachments=self.ctx.texture(
-                self.default_pixel_shape,
-                components=self.n_channels,
-                samples=samples,
-            ),
-            depth_attachment=self.ctx.depth_renderbuffer(
-                self.default_pixel_shape,
-                samples=samples
-            )
+        return lease_framebuffer(
+            self.ctx,
+            self.default_pixel_shape,
+            components=self.n_channels,
+            samples=samples,
         )
 
     def clear(self) -> None:
@@ -138,6 +165,102 @@ class Camera(object):
             gl.GL_COLOR_BUFFER_BIT, gl.GL_LINEAR
         )
 
+    def supports_yuv_readback(self) -> bool:
+        width, height = self.default_pixel_shape
+        return width % 2 == 0 and height % 4 == 0
+
+    def use_yuv_readback(self, use: bool = True) -> None:
+        """
+        When set, frames read back for files are first flipped and converted
+        to planar yuv420p on the GPU, which is under half the bytes of rgba
+        and needs no conversion on ffmpeg's side.
+        """
+        if use and not hasattr(self, "yuv_fbo"):
+            self.init_yuv_conversion()
+        self.yuv_readback = use
+
+    def init_yuv_conversion(self) -> None:
+        assert self.supports_yuv_readback()
+        width, height = self.default_pixel_shape
+        # The Y plane, followed by the U and V planes at half resolution,
+        # each packed two rows to a line, as a single channel image.
+        # Every pixel is overwritten each frame, so no depth buffer is needed
+        self.yuv_fbo = lease_framebuffer(
+            self.ctx, (width, height * 3 // 2), components=1, depth=False
+        )
+        vert = '''
+            #version 330
+
+            in vec2 texcoord;
+
+            void main() {
+                gl_Position = vec4((2.0 * texcoord - 1.0), 0.0, 1.0);
+            }
+        '''
+        frag = '''
+            #version 330
+
+            uniform sampler2D Texture;
+            uniform vec2 frame_size;
+
+            out vec4 frag_color;
+
+            // BT.601 limited range, as in ffmpeg's default rgb to yuv conversion
+            const vec3 Y_COEFFS = vec3(65.481, 128.553, 24.966) / 255.0;
+            const vec3 U_COEFFS = vec3(-37.797, -74.203, 112.0) / 255.0;
+            const vec3 V_COEFFS = vec3(112.0, -93.786, -18.214) / 255.0;
+
+            vec3 sample_rgb(vec2 pixel){
+                // Pixels are measured from the top left, which flips the image
+                return texture(Texture, vec2(pixel.x / frame_size.x, 1.0 - pixel.y / frame_size.y)).rgb;
+            }
+
+            void main() {
+                float w = frame_size.x;
+                float h = frame_size.y;
+                vec2 coord = floor(gl_FragCoord.xy);
+                if(coord.y < h){
+                    frag_color = vec4(16.0 / 255.0 + dot(Y_COEFFS, sample_rgb(coord + 0.5)), 0.0, 0.0, 1.0);
+                    return;
+                }
+                float k = coord.y - h;
+                bool is_v = k >= h / 4.0;
+                if(is_v) k -= h / 4.0;
+                float row = 2.0 * k + (coord.x >= w / 2.0 ? 1.0 : 0.0);
+                float col = mod(coord.x, w / 2.0);
+                // Sampling at the corner shared by a 2x2 block averages it
+                vec3 rgb = sample_rgb(vec2(2.0 * col + 1.0, 2.0 * row + 1.0));
+                float value = 128.0 / 255.0 + dot(is_v ? V_COEFFS : U_COEFFS, rgb);
+                frag_color = vec4(value, 0.0, 0.0, 1.0);
+            }
+        '''
+        program = get_shader_program(self.ctx, vert, frag)
+        program["Texture"].value = 0
+        program["frame_size"].value = (width, height)
+        verts = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+        self.yuv_vbo = self.ctx.buffer(verts.astype('f4').tobytes())
+        self.yuv_vao = self.ctx.simple_vertex_array(
+            program, self.yuv_vbo, 'texcoord',
+            mode=moderngl.TRIANGLE_STRIP
+        )
+
+    def get_frame_for_readback(self) -> tuple[moderngl.Framebuffer, int]:
+        """
+        Copy the current frame into the framebuffer it's read back from,
+        returning that framebuffer and its number of components.
+        """
+        self.blit(self.fbo, self.draw_fbo)
+        if not self.yuv_readback:
+            return self.draw_fbo, self.n_channels
+        # Mobjects may have left depth testing or blending on, neither of
+        # which should apply to the conversion, so turn everything off
+        # for the pass, restoring it afterwards
+        with self.ctx.scope(self.yuv_fbo, enable_only=moderngl.NOTHING):
+            self.draw_fbo.color_attachments[0].use(0)
+            self.yuv_vao.render()
+        self.fbo.use()
+        return self.yuv_fbo, 1
+
     def get_raw_fbo_data(self, dtype: str = 'f1') -> bytes:
         self.blit(self.fbo, self.draw_fbo)
         return self.draw_fbo.read(
@@ -146,6 +269,52 @@ class Camera(object):
             dtype=dtype,
         )
 
+    def queue_raw_fbo_data(self) -> bytes | None:
+        """
+        Start reading the current frame back into the next pixel buffer,
+        without waiting for the GPU, and return the bytes of the frame queued
+        readback_buffers - 1 calls earlier, or None while the ring is still
+        filling up. Frames still in flight are returned by flush_raw_fbo_data.
+        """
+        fbo, components = self.get_frame_for_readback()
+        if not self.readback_buffers:
+            return fbo.read(viewport=fbo.viewport, components=components)
+        buffer = self.readback_buffers[self.readback_index]
+        self.readback_index = (self.readback_index + 1) % len(self.readback_buffers)
+        fbo.read_into(buffer, viewport=fbo.viewport, components=components)
+        width, height = fbo.size
+        self.pending_readbacks.append((buffer, width * height * components))
+        if len(self.pending_readbacks) == len(self.readback_buffers):
+            buffer, n_bytes = self.pending_readbacks.popleft()
+            return buffer.read(n_bytes)
+        return None
+
+    def flush_raw_fbo_data(self) -> list[bytes]:
+        """
+        Return the bytes of all frames queued by queue_raw_fbo_data which
+        haven't been returned yet, oldest first.
+        """
+        result = [buffer.read(n_bytes) for buffer, n_bytes in self.pending_readbacks]
+        self.pending_readbacks.clear()
+        return result
+
+    def release(self) -> None:
+        """
+        Hand this camera's framebuffers back to the shared pool, for the
+        next camera rendering in the same context, and free its other
+        GPU resources. The camera can't be used for rendering afterwards.
+        """
+        for fbo in {self.fbo_for_files, self.draw_fbo, getattr(self, "yuv_fbo", None)}:
+            if fbo is not None:
+                release_framebuffer(fbo)
+        for buffer in self.readback_buffers:
+            buffer.release()
+        if hasattr(self, "yuv_vao"):
+            self.yuv_vao.release()
+            self.yuv_vbo.release()
+        self.readback_buffers = []
+        self.pending_readbacks.clear()
+
     def get_image(self) -> Image.Image:
         return Image.frombytes(
             'RGBA',
@@ -227,7 +396,8 @@ class Camera(object):
         self.refresh_uniforms()
         self.fbo.use()
         for mobject in mobjects:
-            mobject.render(self.ctx, self.uniforms)
+            with PROFILER.time("render", mobject):
+                mobject.render(self.ctx, self.uniforms)
 
         if self.window:
             self.window.swap_buffers()
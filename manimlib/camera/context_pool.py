@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+import moderngl
+
+from manimlib.logger import log
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+
+# Standalone contexts, by backend, shared by every windowless camera in the process
+HEADLESS_CONTEXTS: dict[Optional[str], moderngl.Context] = dict()
+# Framebuffers released by cameras, by context, size, components and samples
+FREE_FRAMEBUFFERS: dict[tuple, list[moderngl.Framebuffer]] = defaultdict(list)
+
+
+def get_headless_context(backend: Optional[str] = None) -> moderngl.Context:
+    """
+    Return the process-wide standalone context for the given backend, e.g.
+    "egl" to render on a GPU without any display server, creating it on first
+    use. As shader programs, textures and framebuffers are cached per context,
+    scenes rendered one after another in the same process reuse all of them
+    rather than compiling and allocating everything again.
+    """
+    if backend not in HEADLESS_CONTEXTS:
+        try:
+            if backend is None:
+                ctx = moderngl.create_standalone_context()
+            else:
+                ctx = moderngl.create_standalone_context(backend=backend)
+        except Exception as e:
+            if backend is None:
+                raise
+            log.warning(f"Could not create {backend} context ({e}), using the default backend")
+            ctx = get_headless_context(None)
+        HEADLESS_CONTEXTS[backend] = ctx
+    return HEADLESS_CONTEXTS[backend]
+
+
+def get_framebuffer_key(
+    ctx: moderngl.Context,
+    size: tuple[int, int],
+    components: int,
+    samples: int,
+    depth: bool,
+) -> tuple:
+    return (ctx, tuple(size), components, samples, depth)
+
+
+def lease_framebuffer(
+    ctx: moderngl.Context,
+    size: tuple[int, int],
+    components: int = 4,
+    samples: int = 0,
+    depth: bool = True,
+) -> moderngl.Framebuffer:
+    """
+    Return a framebuffer with a color texture of the given size, and a
+    depth renderbuffer unless depth is False, reusing one released earlier
+    if there is one. Its contents are undefined until it is cleared.
+    """
+    key = get_framebuffer_key(ctx, size, components, samples, depth)
+    if FREE_FRAMEBUFFERS[key]:
+        return FREE_FRAMEBUFFERS[key].pop()
+    return ctx.framebuffer(
+        color_attachments=ctx.texture(size, components=components, samples=samples),
+        depth_attachment=ctx.depth_renderbuffer(size, samples=samples) if depth else None,
+    )
+
+
+def release_framebuffer(fbo: moderngl.Framebuffer) -> None:
+    """Hand a framebuffer from lease_framebuffer back for later cameras to use"""
+    texture = fbo.color_attachments[0]
+    depth = fbo.depth_attachment is not None
+    key = get_framebuffer_key(fbo.ctx, fbo.size, texture.components, fbo.samples, depth)
+    FREE_FRAMEBUFFERS[key].append(fbo)
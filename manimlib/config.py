@@ -51,178 +51,228 @@ def initialize_manim_config() -> Dict:
     return config
 
 
+def get_cli_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    module_location = parser.add_mutually_exclusive_group()
+    module_location.add_argument(
+        "file",
+        nargs="?",
+        help="Path to file holding the python code for the scene",
+    )
+    parser.add_argument(
+        "scene_names",
+        nargs="*",
+        help="Name of the Scene class you want to see",
+    )
+    parser.add_argument(
+        "-w", "--write_file",
+        action="store_true",
+        help="Render the scene as a movie file",
+    )
+    parser.add_argument(
+        "-s", "--skip_animations",
+        action="store_true",
+        help="Save the last frame",
+    )
+    parser.add_argument(
+        "-l", "--low_quality",
+        action="store_true",
+        help="Render at 480p",
+    )
+    parser.add_argument(
+        "-m", "--medium_quality",
+        action="store_true",
+        help="Render at 720p",
+    )
+    parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="Render quickly at reduced resolution, frame rate and antialiasing, " + \
+             "to check that a scene works, using the draft configuration",
+    )
+    parser.add_argument(
+        "--headless_backend",
+        help="Backend for the OpenGL context used when writing to file " + \
+             "without a window, e.g. \"egl\" on machines with no display",
+    )
+    parser.add_argument(
+        "--hd",
+        action="store_true",
+        help="Render at a 1080p",
+    )
+    parser.add_argument(
+        "--uhd",
+        action="store_true",
+        help="Render at a 4k",
+    )
+    parser.add_argument(
+        "-f", "--full_screen",
+        action="store_true",
+        help="Show window in full screen",
+    )
+    parser.add_argument(
+        "-p", "--presenter_mode",
+        action="store_true",
+        help="Scene will stay paused during wait calls until " + \
+             "space bar or right arrow is hit, like a slide show"
+    )
+    parser.add_argument(
+        "-i", "--gif",
+        action="store_true",
+        help="Save the video as gif",
+    )
+    parser.add_argument(
+        "-t", "--transparent",
+        action="store_true",
+        help="Render to a movie file with an alpha channel",
+    )
+    parser.add_argument(
+        "--vcodec",
+        help="Video codec to use with ffmpeg",
+    )
+    parser.add_argument(
+        "--encoder_profile",
+        help="Named set of encoder settings from the encoder_profiles configuration, " + \
+             "e.g. preview, web or archive",
+    )
+    parser.add_argument(
+        "--pix_fmt",
+        help="Pixel format to use for the output of ffmpeg, defaults to `yuv420p`",
+    )
+    parser.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="",
+    )
+    parser.add_argument(
+        "-a", "--write_all",
+        action="store_true",
+        help="Write all the scenes from a file",
+    )
+    parser.add_argument(
+        "-o", "--open",
+        action="store_true",
+        help="Automatically open the saved file once its done",
+    )
+    parser.add_argument(
+        "--finder",
+        action="store_true",
+        help="Show the output file in finder",
+    )
+    parser.add_argument(
+        "--subdivide",
+        action="store_true",
+        help="Divide the output animation into individual movie files " +
+             "for each animation",
+    )
+    parser.add_argument(
+        "--cache_animations",
+        action="store_true",
+        help="Reuse the movies of animations which are unchanged since " + \
+             "a previous run, rendering only those which changed",
+    )
+    parser.add_argument(
+        "--file_name",
+        help="Name for the movie or image file",
+    )
+    parser.add_argument(
+        "-n", "--start_at_animation_number",
+        help="Start rendering not from the first animation, but " + \
+             "from another, specified by its index.  If you pass " + \
+             "in two comma separated values, e.g. \"3,6\", it will end " + \
+             "the rendering at the second value",
+    )
+    parser.add_argument(
+        "--from-time",
+        type=float,
+        help="Only render frames from this time on, in seconds. Everything " + \
+             "before it is simulated with animations skipped",
+    )
+    parser.add_argument(
+        "--to-time",
+        type=float,
+        help="Stop rendering at this time, in seconds",
+    )
+    parser.add_argument(
+        "-e", "--embed",
+        metavar="LINE_NUMBER",
+        help="Adds a breakpoint at the inputted file dropping into an " + \
+             "interactive iPython session at that point of the code."
+    )
+    parser.add_argument(
+        "-r", "--resolution",
+        help="Resolution, passed as \"WxH\", e.g. \"1920x1080\"",
+    )
+    parser.add_argument(
+        "--fps",
+        help="Frame rate, as an integer",
+    )
+    parser.add_argument(
+        "-c", "--color",
+        help="Background color",
+    )
+    parser.add_argument(
+        "--leave_progress_bars",
+        action="store_true",
+        help="Leave progress bars displayed in terminal",
+    )
+    parser.add_argument(
+        "--show_animation_progress",
+        action="store_true",
+        help="Show progress bar for each animation",
+    )
+    parser.add_argument(
+        "--prerun",
+        action="store_true",
+        help="Show the total framecount in the progress bar, as recorded by " + \
+             "the last render of the same scene code."
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Write the scene using this many processes, each rendering " + \
+             "a range of its animations, and join the results",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Time the stages of rendering each frame, and write a summary " + \
+             "to PROFILE.json and a Chrome trace to PROFILE_trace.json",
+    )
+    parser.add_argument(
+        "--video_dir",
+        help="Directory to write video",
+    )
+    parser.add_argument(
+        "--config_file",
+        help="Path to the custom configuration file",
+    )
+    parser.add_argument(
+        "-v", "--version",
+        action="store_true",
+        help="Display the version of manimgl"
+    )
+    parser.add_argument(
+        "--log-level",
+        help="Level of messages to Display, can be DEBUG / INFO / WARNING / ERROR / CRITICAL"
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Erase the cache used for Tex and Text Mobjects"
+    )
+    parser.add_argument(
+        "--autoreload",
+        action="store_true",
+        help="Automatically reload Python modules to pick up code changes " +
+             "across different files",
+    )
+    return parser
+
+
 def parse_cli():
     try:
-        parser = argparse.ArgumentParser()
-        module_location = parser.add_mutually_exclusive_group()
-        module_location.add_argument(
-            "file",
-            nargs="?",
-            help="Path to file holding the python code for the scene",
-        )
-        parser.add_argument(
-            "scene_names",
-            nargs="*",
-            help="Name of the Scene class you want to see",
-        )
-        parser.add_argument(
-            "-w", "--write_file",
-            action="store_true",
-            help="Render the scene as a movie file",
-        )
-        parser.add_argument(
-            "-s", "--skip_animations",
-            action="store_true",
-            help="Save the last frame",
-        )
-        parser.add_argument(
-            "-l", "--low_quality",
-            action="store_true",
-            help="Render at 480p",
-        )
-        parser.add_argument(
-            "-m", "--medium_quality",
-            action="store_true",
-            help="Render at 720p",
-        )
-        parser.add_argument(
-            "--hd",
-            action="store_true",
-            help="Render at a 1080p",
-        )
-        parser.add_argument(
-            "--uhd",
-            action="store_true",
-            help="Render at a 4k",
-        )
-        parser.add_argument(
-            "-f", "--full_screen",
-            action="store_true",
-            help="Show window in full screen",
-        )
-        parser.add_argument(
-            "-p", "--presenter_mode",
-            action="store_true",
-            help="Scene will stay paused during wait calls until " + \
-                 "space bar or right arrow is hit, like a slide show"
-        )
-        parser.add_argument(
-            "-i", "--gif",
-            action="store_true",
-            help="Save the video as gif",
-        )
-        parser.add_argument(
-            "-t", "--transparent",
-            action="store_true",
-            help="Render to a movie file with an alpha channel",
-        )
-        parser.add_argument(
-            "--vcodec",
-            help="Video codec to use with ffmpeg",
-        )
-        parser.add_argument(
-            "--pix_fmt",
-            help="Pixel format to use for the output of ffmpeg, defaults to `yuv420p`",
-        )
-        parser.add_argument(
-            "-q", "--quiet",
-            action="store_true",
-            help="",
-        )
-        parser.add_argument(
-            "-a", "--write_all",
-            action="store_true",
-            help="Write all the scenes from a file",
-        )
-        parser.add_argument(
-            "-o", "--open",
-            action="store_true",
-            help="Automatically open the saved file once its done",
-        )
-        parser.add_argument(
-            "--finder",
-            action="store_true",
-            help="Show the output file in finder",
-        )
-        parser.add_argument(
-            "--subdivide",
-            action="store_true",
-            help="Divide the output animation into individual movie files " +
-                 "for each animation",
-        )
-        parser.add_argument(
-            "--file_name",
-            help="Name for the movie or image file",
-        )
-        parser.add_argument(
-            "-n", "--start_at_animation_number",
-            help="Start rendering not from the first animation, but " + \
-                 "from another, specified by its index.  If you pass " + \
-                 "in two comma separated values, e.g. \"3,6\", it will end " + \
-                 "the rendering at the second value",
-        )
-        parser.add_argument(
-            "-e", "--embed",
-            metavar="LINE_NUMBER",
-            help="Adds a breakpoint at the inputted file dropping into an " + \
-                 "interactive iPython session at that point of the code."
-        )
-        parser.add_argument(
-            "-r", "--resolution",
-            help="Resolution, passed as \"WxH\", e.g. \"1920x1080\"",
-        )
-        parser.add_argument(
-            "--fps",
-            help="Frame rate, as an integer",
-        )
-        parser.add_argument(
-            "-c", "--color",
-            help="Background color",
-        )
-        parser.add_argument(
-            "--leave_progress_bars",
-            action="store_true",
-            help="Leave progress bars displayed in terminal",
-        )
-        parser.add_argument(
-            "--show_animation_progress",
-            action="store_true",
-            help="Show progress bar for each animation",
-        )
-        parser.add_argument(
-            "--prerun",
-            action="store_true",
-            help="Calculate total framecount, to display in a progress bar, by doing " + \
-                 "an initial run of the scene which skips animations."
-        )
-        parser.add_argument(
-            "--video_dir",
-            help="Directory to write video",
-        )
-        parser.add_argument(
-            "--config_file",
-            help="Path to the custom configuration file",
-        )
-        parser.add_argument(
-            "-v", "--version",
-            action="store_true",
-            help="Display the version of manimgl"
-        )
-        parser.add_argument(
-            "--log-level",
-            help="Level of messages to Display, can be DEBUG / INFO / WARNING / ERROR / CRITICAL"
-        )
-        parser.add_argument(
-            "--clear-cache",
-            action="store_true",
-            help="Erase the cache used for Tex and Text Mobjects"
-        )
-        parser.add_argument(
-            "--autoreload",
-            action="store_true",
-            help="Automatically reload Python modules to pick up code changes " +
-                 "across different files",
-        )
+        parser = get_cli_parser()
         args = parser.parse_args()
         args.write_file = any([args.write_file, args.open, args.finder])
         return args
@@ -251,6 +301,13 @@ def update_camera_config(config: Dict, args: Namespace):
     camera_config = config.camera
     arg_resolution = get_resolution_from_args(args, config.resolution_options)
     camera_config.resolution = arg_resolution or literal_eval(camera_config.resolution)
+    if args.draft:
+        # Explicit resolution and fps arguments still take precedence
+        draft_config = config.draft
+        camera_config.resolution = arg_resolution or literal_eval(draft_config.resolution)
+        camera_config.fps = draft_config.fps
+        camera_config.samples = draft_config.samples
+        config.vmobject.fill_canvas_scale = draft_config.fill_canvas_scale
     if args.fps:
         camera_config.fps = args.fps
     if args.color:
@@ -262,6 +319,8 @@ def update_camera_config(config: Dict, args: Namespace):
             sys.exit(2)
     if args.transparent:
         camera_config.background_opacity = 0.0
+    if args.headless_backend:
+        camera_config.headless_backend = args.headless_backend
 
 
 def update_file_writer_config(config: Dict, args: Namespace):
@@ -279,6 +338,18 @@ def update_file_writer_config(config: Dict, args: Namespace):
         quiet=args.quiet,
     )
 
+    if args.cache_animations:
+        file_writer_config.cache_partial_movies = True
+
+    encoder_profile = args.encoder_profile
+    if args.draft and not encoder_profile:
+        encoder_profile = config.draft.encoder_profile
+    if encoder_profile:
+        if encoder_profile not in config.encoder_profiles:
+            log.error(f"No encoder profile named {encoder_profile}")
+            sys.exit(2)
+        file_writer_config.update(config.encoder_profiles[encoder_profile])
+
     if args.vcodec:
         file_writer_config.video_codec = args.vcodec
     elif args.transparent:
@@ -303,6 +374,8 @@ def update_scene_config(config: Dict, args: Namespace):
         skip_animations=args.skip_animations,
         start_at_animation_number=start,
         end_at_animation_number=end,
+        start_at_time=args.from_time,
+        end_at_time=args.to_time,
         presenter_mode=args.presenter_mode,
     )
     if args.leave_progress_bars:
@@ -317,6 +390,8 @@ def update_run_config(config: Dict, args: Namespace):
         embed_line=(int(args.embed) if args.embed is not None else None),
         is_reload=False,
         prerun=args.prerun,
+        parallel=args.parallel,
+        profile=args.profile,
         scene_names=args.scene_names,
         quiet=args.quiet or args.write_all,
         write_all=args.write_all,
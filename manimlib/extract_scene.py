@@ -8,6 +8,7 @@ from manimlib.module_loader import ModuleLoader
 
 from manimlib.config import manim_config
 from manimlib.logger import log
+from manimlib.parallel_render import ParallelSceneRender
 from manimlib.scene.interactive_scene import InteractiveScene
 from manimlib.scene.scene import Scene
 
@@ -59,12 +60,10 @@ def prompt_user_for_choice(scene_classes):
         sys.exit(1)
 
 
-def compute_total_frames(scene_class, scene_config):
+def prerun_scene(scene_class, scene_config):
     """
-    When a scene is being written to file, a copy of the scene is run with
-    skip_animations set to true so as to count how many frames it will require.
-    This allows for a total progress bar on rendering, and also allows runtime
-    errors to be exposed preemptively for long running scenes.
+    Run a copy of the scene with skip_animations set to true, without
+    writing anything, and return it.
     """
     pre_config = copy.deepcopy(scene_config)
     pre_config["file_writer_config"]["write_to_movie"] = False
@@ -73,15 +72,27 @@ def compute_total_frames(scene_class, scene_config):
     pre_config["skip_animations"] = True
     pre_scene = scene_class(**pre_config)
     pre_scene.run()
-    total_time = pre_scene.time - pre_scene.skip_time
-    return int(total_time * manim_config.camera.fps)
+    return pre_scene
 
 
 def scene_from_class(scene_class, scene_config: Dict, run_config: Dict):
     fw_config = manim_config.file_writer
+    if fw_config.write_to_movie and run_config.parallel > 1:
+        # The skip pass finds where to split the scene between processes
+        pre_scene = prerun_scene(scene_class, scene_config)
+        if not pre_scene.adds_sound:
+            return ParallelSceneRender(scene_class, scene_config, run_config, pre_scene)
+        log.warning(
+            f"{scene_class.__name__} adds sound, which isn't carried into " + \
+            "movies rendered in parallel, so it's rendered in one process"
+        )
+    scene = scene_class(**scene_config)
     if fw_config.write_to_movie and run_config.prerun:
-        scene_config.file_writer_config.total_frames = compute_total_frames(scene_class, scene_config)
-    return scene_class(**scene_config)
+        # Rather than running construct twice, the progress display starts from
+        # the frame count of the last render of the same code, if there is one,
+        # and otherwise grows as animations begin
+        scene.file_writer.total_frames = scene.get_recorded_total_frames()
+    return scene
 
 
 def note_missing_scenes(arg_names, module_names):
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import numpy as np
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+    from manimlib.mobject.mobject import Mobject
+
+
+class FamilyDataArena(object):
+    """
+    Holds the data of every member of a mobject's family in one contiguous
+    array, in family order, with each member's data being a view into it.
+    Family-wide operations on points, and uploads of consecutive members to
+    a shader, can then act on the whole array at once instead of looping
+    over members and concatenating their data.
+
+    Writes to a member's data land in the arena, but anything reallocating
+    it, like changing its number of points, detaches it, as does changing
+    the family, after which the arena is no longer used.
+    """
+    def __init__(self, root: Mobject):
+        self.root = root
+        self.family = root.get_family()
+        self.data = np.concatenate([mob.data for mob in self.family])
+        lengths = [len(mob.data) for mob in self.family]
+        self.offsets = np.cumsum([0, *lengths])
+        self.member_index = {id(mob): i for i, mob in enumerate(self.family)}
+        for mob, start, end in zip(self.family, self.offsets[:-1], self.offsets[1:]):
+            mob.data = self.data[start:end]
+            mob.data_arena = self
+        self.views = [mob.data for mob in self.family]
+
+    @staticmethod
+    def can_hold(family: list[Mobject]) -> bool:
+        """Whether a family's data is uniform enough to share one array"""
+        dtype = family[0].data.dtype
+        keys = family[0].pointlike_data_keys
+        return all(
+            mob.data.dtype == dtype and mob.pointlike_data_keys == keys
+            for mob in family
+        )
+
+    def is_valid(self) -> bool:
+        return self.root.get_family() is self.family and all(
+            mob.data is view
+            for mob, view in zip(self.family, self.views)
+        )
+
+    def get_pointlike_arrays(self) -> list[np.ndarray]:
+        return [self.data[key] for key in self.root.pointlike_data_keys]
+
+    def get_members_data(self, members: list[Mobject]) -> Optional[np.ndarray]:
+        """
+        If the given mobjects are consecutive among the members of the family
+        with points, return the view of the arena spanning their data,
+        otherwise None.
+        """
+        start = self.member_index.get(id(members[0]))
+        end = self.member_index.get(id(members[-1]))
+        if start is None or end is None:
+            return None
+        span_members = [mob for mob in self.family[start:end + 1] if len(mob.data) > 0]
+        if span_members != members:
+            return None
+        return self.data[self.offsets[start]:self.offsets[end + 1]]
+
+    # Copies of mobjects hold their own data, so they start without an arena
+    def __deepcopy__(self, memo: dict) -> None:
+        return None
+
+    def __reduce__(self):
+        return (type(None), ())
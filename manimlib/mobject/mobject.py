@@ -23,6 +23,7 @@ from manimlib.event_handler import EVENT_DISPATCHER
 from manimlib.event_handler.event_listner import EventListener
 from manimlib.event_handler.event_type import EventType
 from manimlib.logger import log
+from manimlib.mobject.data_arena import FamilyDataArena
 from manimlib.shader_wrapper import ShaderWrapper
 from manimlib.utils.color import color_gradient
 from manimlib.utils.color import color_to_rgb
@@ -39,6 +40,7 @@ from manimlib.utils.iterables import resize_with_interpolation
 from manimlib.utils.bezier import integer_interpolate
 from manimlib.utils.bezier import interpolate
 from manimlib.utils.paths import straight_path
+from manimlib.utils.profiling import PROFILER
 from manimlib.utils.shaders import get_colormap_code
 from manimlib.utils.space_ops import angle_of_vector
 from manimlib.utils.space_ops import get_norm
@@ -61,6 +63,10 @@ if TYPE_CHECKING:
     Updater = Union[TimeBasedUpdater, NonTimeUpdater]
 
 
+# Source of the generations bounding boxes are stamped with whenever they change
+BOUNDING_BOX_GENERATIONS = it.count()
+
+
 class Mobject(object):
     """
     Mathematical Object
@@ -75,6 +81,8 @@ class Mobject(object):
     ])
     aligned_data_keys = ['point']
     pointlike_data_keys = ['point']
+    # Fields of data computed from the rest of it when rendering
+    derived_data_keys = []
 
     def __init__(
         self,
@@ -99,6 +107,7 @@ class Mobject(object):
         self.submobjects: list[Mobject] = []
         self.parents: list[Mobject] = []
         self.family: list[Mobject] | None = [self]
+        self.pointlike_data_members: dict[str, list[Mobject]] | None = None
         self.locked_data_keys: set[str] = set()
         self.const_data_keys: set[str] = set()
         self.locked_uniform_keys: set[str] = set()
@@ -106,8 +115,12 @@ class Mobject(object):
         self.target = None
         self.bounding_box: Vect3Array = np.zeros((3, 3))
         self.shader_wrapper: Optional[ShaderWrapper] = None
+        self.data_arena: Optional[FamilyDataArena] = None
         self._is_animating: bool = False
         self._needs_new_bounding_box: bool = True
+        self._bounding_box_generation: int = next(BOUNDING_BOX_GENERATIONS)
+        self._bounding_box_is_empty: bool = True
+        self._submobject_box_cache: tuple | None = None
         self._data_has_changed: bool = True
         self.shader_code_replacements: dict[str, str] = dict()
 
@@ -213,6 +226,7 @@ class Mobject(object):
     def affects_data(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         def wrapper(self, *args, **kwargs):
+            self.ensure_own_data()
             result = func(self, *args, **kwargs)
             self.note_changed_data()
             return result
@@ -222,12 +236,25 @@ class Mobject(object):
     def affects_family_data(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         def wrapper(self, *args, **kwargs):
+            self.ensure_own_data(recurse=True)
             result = func(self, *args, **kwargs)
             for mob in self.family_members_with_points():
                 mob.note_changed_data()
             return result
         return wrapper
 
+    def ensure_own_data(self, recurse: bool = False) -> Self:
+        """
+        Copies share their data with the mobject they were copied from
+        until either one writes to it, at which point the one writing
+        takes its own copy. Anything writing to data other than through
+        the methods marked with affects_data should call this first.
+        """
+        for mob in self.get_family(recurse):
+            if not mob.data.flags.writeable:
+                mob.data = mob.data.copy()
+        return self
+
     # Only these methods should directly affect points
     @affects_data
     def set_data(self, data: np.ndarray) -> Self:
@@ -286,19 +313,37 @@ class Mobject(object):
         if about_point is None and about_edge is not None:
             about_point = self.get_bounding_box_point(about_edge)
 
-        for mob in self.get_family():
-            arrs = []
-            if mob.has_points():
-                for key in mob.pointlike_data_keys:
-                    arrs.append(mob.data[key])
-            if works_on_bounding_box:
-                arrs.append(mob.get_bounding_box())
+        def apply(arrs):
+            # Call func once on all the arrays together, rather than
+            # once per array, and scatter the results back
+            full_arr = arrs[0] if len(arrs) == 1 else np.concatenate(arrs)
+            if len(full_arr) == 0:
+                return
+            if about_point is None:
+                full_arr[:] = func(full_arr)
+            else:
+                full_arr[:] = func(full_arr - about_point) + about_point
+            if len(arrs) > 1:
+                ends = np.cumsum([len(arr) for arr in arrs])
+                for arr, end in zip(arrs, ends):
+                    arr[:] = full_arr[end - len(arr):end]
+
+        if works_on_bounding_box:
+            # Taken before any points move
+            boxes = [mob.get_bounding_box() for mob in self.get_family()]
+
+        arena = self.get_family_data_arena()
+        if arena is not None:
+            # The points of the whole family are contiguous, so are transformed in place
+            for arr in arena.get_pointlike_arrays():
+                apply([arr])
+        else:
+            for key, mobs in self.get_pointlike_data_members().items():
+                apply([mob.data[key] for mob in mobs])
 
-            for arr in arrs:
-                if about_point is None:
-                    arr[:] = func(arr)
-                else:
-                    arr[:] = func(arr - about_point) + about_point
+        if works_on_bounding_box:
+            apply(boxes)
+            self.note_changed_bounding_box(recurse=True)
 
         if not works_on_bounding_box:
             self.refresh_bounding_box(recurse_down=True)
@@ -324,14 +369,52 @@ class Mobject(object):
         return len(self.get_points())
 
     def get_all_points(self) -> Vect3Array:
-        if self.submobjects:
-            return np.vstack([sm.get_points() for sm in self.get_family()])
-        else:
+        if not self.submobjects:
             return self.get_points()
+        arena = self.get_family_data_arena()
+        if arena is not None:
+            return arena.data["point"]
+        return np.vstack([sm.get_points() for sm in self.get_family()])
 
     def has_points(self) -> bool:
         return len(self.get_points()) > 0
 
+    def get_pointlike_data_members(self) -> dict[str, list[Mobject]]:
+        """
+        Maps each pointlike data key of the family to the members with that
+        key, in family order. This is cached until the family changes.
+        """
+        if self.pointlike_data_members is None:
+            members = dict()
+            for mob in self.get_family():
+                for key in mob.pointlike_data_keys:
+                    members.setdefault(key, []).append(mob)
+            self.pointlike_data_members = members
+        return self.pointlike_data_members
+
+    def pack_family_data(self) -> Self:
+        """
+        Opt in to storing the data of the whole family in one contiguous array,
+        which each member's data is a view into, so that family-wide transforms
+        and shader uploads act on it in one go. This lasts until the family
+        changes or some member's number of points does; call again to repack.
+        Families mixing mobjects with different data, e.g. VMobjects and
+        Surfaces, are left as they are.
+        """
+        if FamilyDataArena.can_hold(self.get_family()):
+            FamilyDataArena(self)
+        return self
+
+    def get_family_data_arena(self) -> FamilyDataArena | None:
+        """Returns the arena packed by pack_family_data, while it's still valid"""
+        arena = self.data_arena
+        if arena is None or arena.root is not self:
+            return None
+        if not arena.is_valid():
+            self.data_arena = None
+            return None
+        return arena
+
     def get_bounding_box(self) -> Vect3Array:
         if self._needs_new_bounding_box:
             self.bounding_box[:] = self.compute_bounding_box()
@@ -339,33 +422,69 @@ class Mobject(object):
         return self.bounding_box
 
     def compute_bounding_box(self) -> Vect3Array:
-        all_points = np.vstack([
-            self.get_points(),
-            *(
-                mob.get_bounding_box()
-                for mob in self.get_family()[1:]
-                if mob.has_points()
-            )
-        ])
-        if len(all_points) == 0:
+        points = self.get_points()
+        submob_corners = self.get_submobject_box_corners()
+        self._bounding_box_is_empty = len(points) == 0 and len(submob_corners) == 0
+        if self._bounding_box_is_empty:
             return np.zeros((3, self.dim))
-        else:
-            # Lower left and upper right corners
-            mins = all_points.min(0)
-            maxs = all_points.max(0)
-            mids = (mins + maxs) / 2
-            return np.array([mins, mids, maxs])
+
+        # Lower left and upper right corners
+        mins = submob_corners[:, 0].min(0, initial=np.inf)
+        maxs = submob_corners[:, 1].max(0, initial=-np.inf)
+        if len(points) > 0:
+            mins = np.minimum(mins, points.min(0))
+            maxs = np.maximum(maxs, points.max(0))
+        mids = (mins + maxs) / 2
+        return np.array([mins, mids, maxs])
+
+    def get_submobject_box_corners(self) -> np.ndarray:
+        """
+        Returns the lower left and upper right corners of the bounding boxes
+        of the submobjects with any points in their family, in an array of
+        shape (n, 2, dim). These are cached along with the generation of each
+        submobject's bounding box, so only submobjects whose bounding box has
+        changed since the last call are revisited.
+        """
+        submobs = self.submobjects
+        cache = self._submobject_box_cache
+        if cache is None or cache[0] != submobs:
+            n = len(submobs)
+            cache = (list(submobs), [None] * n, np.zeros((n, 2, self.dim)), np.zeros(n, dtype=bool))
+            self._submobject_box_cache = cache
+        _, generations, corners, has_points = cache
+        for i, submob in enumerate(submobs):
+            if generations[i] == submob._bounding_box_generation:
+                continue
+            bb = submob.get_bounding_box()
+            corners[i] = bb[0::2]
+            has_points[i] = submob.has_points() or not submob._bounding_box_is_empty
+            generations[i] = submob._bounding_box_generation
+        return corners[has_points]
 
     def refresh_bounding_box(
         self,
         recurse_down: bool = False,
         recurse_up: bool = True
     ) -> Self:
+        generation = next(BOUNDING_BOX_GENERATIONS)
         for mob in self.get_family(recurse_down):
             mob._needs_new_bounding_box = True
+            mob._bounding_box_generation = generation
         if recurse_up:
             for parent in self.parents:
-                parent.refresh_bounding_box()
+                # A parent already waiting on a new bounding box has its ancestors waiting too
+                if not parent._needs_new_bounding_box:
+                    parent.refresh_bounding_box()
+        return self
+
+    def note_changed_bounding_box(self, recurse: bool = False) -> Self:
+        """
+        For when a bounding box is changed in place, rather than recomputed,
+        so that parents don't keep using the cached corners of the old one
+        """
+        generation = next(BOUNDING_BOX_GENERATIONS)
+        for mob in self.get_family(recurse):
+            mob._bounding_box_generation = generation
         return self
 
     def are_points_touching(
@@ -413,6 +532,7 @@ class Mobject(object):
     @affects_data
     def note_changed_family(self, only_changed_order=False) -> Self:
         self.family = None
+        self.pointlike_data_members = None
         if not only_changed_order:
             self.refresh_has_updater_status()
             self.refresh_bounding_box()
@@ -683,20 +803,32 @@ class Mobject(object):
         for sm in result.submobjects:
             sm.parents = [result]
         result.family = [result, *it.chain(*(sm.get_family() for sm in result.submobjects))]
+        result.pointlike_data_members = None
+        result._submobject_box_cache = None
 
         # Similarly, instead of calling match_updaters, since we know the status
         # won't have changed, just directly match.
         result.updaters = list(self.updaters)
         result._data_has_changed = True
         result.shader_wrapper = None
+        result.data_arena = None
 
         family = self.get_family()
         for attr, value in self.__dict__.items():
             if isinstance(value, Mobject) and value is not self:
                 if value in family:
                     setattr(result, attr, result.family[family.index(value)])
-            elif isinstance(value, np.ndarray):
+            elif isinstance(value, np.ndarray) and attr != "data":
                 setattr(result, attr, value.copy())
+
+        # Rather than copying data, share it, marked as read-only, and let
+        # whichever of the two writes to it first take its own copy (see
+        # ensure_own_data). Data held in an arena is a view which the arena
+        # keeps writing to, so it's copied right away.
+        if self.data_arena is None:
+            self.data.flags.writeable = False
+        else:
+            result.data = self.data.copy()
         return result
 
     def generate_target(self, use_deepcopy: bool = False) -> Self:
@@ -731,7 +863,9 @@ class Mobject(object):
             sm1.texture_paths = sm2.texture_paths
             sm1.depth_test = sm2.depth_test
             sm1.render_primitive = sm2.render_primitive
-            sm1._needs_new_bounding_box = sm2._needs_new_bounding_box
+        # Rather than carrying over which boxes were stale, mark them all,
+        # which also marks the boxes of any groups this belongs to
+        self.refresh_bounding_box(recurse_down=True)
         # Make sure named family members carry over
         for attr, value in list(mobject.__dict__.items()):
             if isinstance(value, Mobject) and value in family2:
@@ -1803,6 +1937,7 @@ class Mobject(object):
     ) -> Self:
         keys = [k for k in self.data.dtype.names if k not in self.locked_data_keys]
         if keys:
+            self.ensure_own_data()
             self.note_changed_data()
         for key in keys:
             md1 = mobject1.data[key]
@@ -1822,6 +1957,7 @@ class Mobject(object):
                 continue
             self.uniforms[key] = (1 - alpha) * mobject1.uniforms[key] + alpha * mobject2.uniforms[key]
         self.bounding_box[:] = path_func(mobject1.bounding_box, mobject2.bounding_box, alpha)
+        self.note_changed_bounding_box()
         return self
 
     def pointwise_become_partial(self, mobject, a, b) -> Self:
@@ -2032,12 +2168,39 @@ class Mobject(object):
         result = []
         for submobs, sid in batches:
             shader_wrapper = submobs[0].shader_wrapper
-            data_list = [sm.get_shader_data() for sm in submobs]
-            shader_wrapper.read_in(data_list)
+            data_list = self.get_batch_shader_data(submobs)
+            with PROFILER.time("read_in"):
+                shader_wrapper.read_in(data_list)
             result.append(shader_wrapper)
         return result
 
+    @staticmethod
+    def get_batch_shader_data(submobs: list[Mobject]) -> list[np.ndarray]:
+        arena = submobs[0].data_arena
+        span = None
+        if arena is not None and arena.is_valid():
+            span = arena.get_members_data(submobs)
+        if span is None:
+            return [sm.get_shader_data() for sm in submobs]
+
+        # The batch's data is already contiguous in a family data arena
+        for sm in submobs:
+            sm.refresh_shader_data()
+        index_list = [sm.get_shader_vert_indices() for sm in submobs]
+        if all(indices is None for indices in index_list):
+            return [span]
+        offsets = np.cumsum([0, *(len(sm.data) for sm in submobs[:-1])])
+        return [span[np.concatenate([
+            offset + (np.arange(len(sm.data)) if indices is None else indices)
+            for sm, indices, offset in zip(submobs, index_list, offsets)
+        ])]]
+
+    def refresh_shader_data(self) -> None:
+        # For subclasses which derive some of their data lazily
+        pass
+
     def get_shader_data(self) -> np.ndarray:
+        self.refresh_shader_data()
         indices = self.get_shader_vert_indices()
         if indices is not None:
             return self.data[indices]
@@ -2052,12 +2215,14 @@ class Mobject(object):
 
     def render(self, ctx: Context, camera_uniforms: dict):
         if self._data_has_changed:
-            self.shader_wrappers = self.get_shader_wrapper_list(ctx)
+            with PROFILER.time("get_shader_wrapper_list"):
+                self.shader_wrappers = self.get_shader_wrapper_list(ctx)
             self._data_has_changed = False
-        for shader_wrapper in self.shader_wrappers:
-            shader_wrapper.update_program_uniforms(camera_uniforms)
-            shader_wrapper.pre_render()
-            shader_wrapper.render()
+        with PROFILER.time("draw"):
+            for shader_wrapper in self.shader_wrappers:
+                shader_wrapper.update_program_uniforms(camera_uniforms)
+                shader_wrapper.pre_render()
+                shader_wrapper.render()
 
     # Event Handlers
     """
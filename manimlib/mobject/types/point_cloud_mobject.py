@@ -78,6 +78,7 @@ class PMobject(Mobject):
         function is any map from R^3 to R
         """
         for mob in self.family_members_with_points():
+            mob.ensure_own_data()
             indices = np.argsort(
                 np.apply_along_axis(function, 1, mob.get_points())
             )
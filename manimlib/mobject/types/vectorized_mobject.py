@@ -67,6 +67,7 @@ class VMobject(Mobject):
         ('base_normal', np.float32, (3,)),  # Base points and unit normal vectors are interleaved in this array
         ('fill_border_width', np.float32, (1,)),
     ])
+    derived_data_keys = ['joint_angle', 'base_normal']
     pre_function_handle_to_anchor_scale_factor: float = 0.01
     make_smooth_after_applying_functions: bool = False
     # TODO, do we care about accounting for varying zoom levels?
@@ -167,6 +168,7 @@ class VMobject(Mobject):
         if border_width is not None:
             self.border_width = border_width
             for mob in self.get_family(recurse):
+                mob.ensure_own_data()
                 data = mob.data if mob.has_points() > 0 else mob._data_defaults
                 data["fill_border_width"] = border_width
         return self
@@ -184,6 +186,7 @@ class VMobject(Mobject):
 
         if width is not None:
             for mob in self.get_family(recurse):
+                mob.ensure_own_data()
                 data = mob.data if mob.get_num_points() > 0 else mob._data_defaults
                 if isinstance(width, (float, int)):
                     data['stroke_width'][:, 0] = width
@@ -449,6 +452,7 @@ class VMobject(Mobject):
             self.clear_points()
             return self
         assert len(anchors) == len(handles) + 1
+        self.ensure_own_data()
         points = resize_array(self.get_points(), 2 * len(anchors) - 1)
         points[0::2] = anchors
         points[1::2] = handles
@@ -895,6 +899,7 @@ class VMobject(Mobject):
         else:
             p = self.get_points()
             normal = get_unit_normal(p[1] - p[0], p[2] - p[1])
+        self.ensure_own_data()
         self.data["base_normal"][1::2] = normal
         self.needs_new_unit_normal = False
         return normal
@@ -1010,6 +1015,7 @@ class VMobject(Mobject):
 
     def pointwise_become_partial(self, vmobject: VMobject, a: float, b: float) -> Self:
         assert isinstance(vmobject, VMobject)
+        self.ensure_own_data()
         vm_points = vmobject.get_points()
         self.data["joint_angle"] = vmobject.data["joint_angle"]
         if a <= 0 and b >= 1:
@@ -1176,6 +1182,7 @@ class VMobject(Mobject):
         angle_diffs = angles_out - angles_in
         angle_diffs[angle_diffs < -PI] += TAU
         angle_diffs[angle_diffs > PI] -= TAU
+        self.ensure_own_data()
         self.data["joint_angle"][:, 0] = angle_diffs
         return self.data["joint_angle"][:, 0]
 
@@ -1213,6 +1220,7 @@ class VMobject(Mobject):
             if not mob.has_points():
                 continue
             inner_ends = mob.get_subpath_end_indices()[:-1]
+            mob.ensure_own_data()
             mob.data["point"][inner_ends + 1] = mob.data["point"][inner_ends + 2]
             mob.data["base_normal"][1::2] *= -1  # Invert normal vector
             self.subpath_end_indices = None
@@ -1285,11 +1293,11 @@ class VMobject(Mobject):
         super().refresh_shader_wrapper_id()
         return self
 
-    def get_shader_data(self) -> np.ndarray:
+    def refresh_shader_data(self) -> None:
         # Do we want this elsewhere? Say whenever points are refreshed or something?
         self.get_joint_angles()
+        self.ensure_own_data()
         self.data["base_normal"][0::2] = self.data["point"][0]
-        return super().get_shader_data()
 
     def get_shader_vert_indices(self) -> Optional[np.ndarray]:
         return self.get_outer_vert_indices()
@@ -244,6 +244,7 @@ class VectorField(VMobject):
 
     def set_stroke_width(self, width: float):
         if self.get_num_points() > 0:
+            self.ensure_own_data()
             self.get_stroke_widths()[:] = width * self.base_stroke_width_array
             self.stroke_width = width
         return self
@@ -277,6 +278,7 @@ class VectorField(VMobject):
         dist_to_head_base = np.clip(drawn_norms - tip_len, 0, np.inf)  # Mixing units!
 
         # Set all points
+        self.ensure_own_data()
         points = self.get_points()
         points[0::8] = self.sample_points
         points[2::8] = self.sample_points + dist_to_head_base * unit_outputs
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import shutil
+import subprocess as sp
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from manimlib.config import get_cli_parser
+from manimlib.logger import log
+from manimlib.utils.file_ops import guarantee_existence
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from addict import Dict
+
+    from manimlib.scene.scene import Scene
+
+
+# Destinations of command line arguments which are not passed on to the processes
+# rendering segments, either because they don't apply to a segment, or because
+# they are set explicitly
+EXCLUDED_ARGUMENTS = {
+    "file", "scene_names", "write_all", "open", "finder", "prerun", "embed", "profile",
+    "write_file", "quiet", "start_at_animation_number", "file_name", "video_dir",
+    "parallel", "clear_cache", "version",
+}
+# Destinations of options spelled with dashes, e.g. --from-time, rather than underscores
+DASHED_OPTIONS = {"from_time", "to_time", "log_level"}
+
+
+class ParallelSceneRender(object):
+    """
+    Writes a scene to file using several processes, each of which renders a
+    contiguous range of its animations, i.e. of its play and wait calls, with
+    its own headless context. The resulting segments are then joined with
+    ffmpeg's concat demuxer, without re-encoding.
+
+    Ranges are chosen so that each covers about the same duration, based on
+    the timeline recorded by a run of the scene with animations skipped.
+    Each process still runs construct up to the start of its range, skipping
+    animations, so this pays off when rendering dominates construction.
+    """
+    def __init__(
+        self,
+        scene_class: type,
+        scene_config: Dict,
+        run_config: Dict,
+        prerun_scene: Scene,
+    ):
+        self.scene_class = scene_class
+        self.scene_config = scene_config
+        self.run_config = run_config
+        self.n_processes = run_config.parallel
+
+        file_writer = prerun_scene.file_writer
+        self.movie_file_extension = file_writer.movie_file_extension
+        self.output_file_rootname = file_writer.get_output_file_rootname()
+        self.movie_file_path = self.output_file_rootname.with_suffix(self.movie_file_extension)
+        self.segment_directory = Path(str(self.output_file_rootname) + "_segments")
+        self.play_end_times = prerun_scene.play_end_times
+        self.quiet = run_config.quiet
+        self.ffmpeg_bin = file_writer.ffmpeg_bin
+
+    def __str__(self) -> str:
+        return self.scene_class.__name__
+
+    def get_segment_ranges(self) -> list[tuple[int, int]]:
+        """
+        Split the animations to render into at most n_processes ranges
+        of roughly equal duration, as (start, end) animation numbers.
+        """
+        start = self.scene_config.start_at_animation_number or 0
+        end = self.scene_config.end_at_animation_number
+        end_times = np.array(self.play_end_times[:end])
+        # Leave out animations outside of the time range being rendered
+        if self.scene_config.end_at_time is not None:
+            n_started = np.searchsorted(end_times, self.scene_config.end_at_time, side="left") + 1
+            end_times = end_times[:n_started]
+        if self.scene_config.start_at_time is not None:
+            start = max(start, int(np.searchsorted(end_times, self.scene_config.start_at_time, side="right")))
+        if start >= len(end_times):
+            return []
+        start_time = end_times[start - 1] if start > 0 else 0
+        durations = np.diff(end_times[start:], prepend=start_time)
+
+        n_segments = max(min(self.n_processes, len(durations)), 1)
+        targets = np.linspace(0, durations.sum(), n_segments + 1)[1:-1]
+        cuts = np.searchsorted(np.cumsum(durations), targets, side="right")
+        bounds = sorted({start, *(start + cuts), start + len(durations)})
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def get_worker_options(self) -> list[str]:
+        """
+        Options from this process's command line, so that resolution, fps,
+        config files, etc. all carry over. They're rebuilt from the parsed
+        arguments, so that e.g. combined short flags like -ow are handled.
+        """
+        parser = get_cli_parser()
+        options = []
+        for dest, value in vars(parser.parse_args()).items():
+            if dest in EXCLUDED_ARGUMENTS:
+                continue
+            if value is None or value is False or value == parser.get_default(dest):
+                continue
+            name = dest.replace("_", "-") if dest in DASHED_OPTIONS else dest
+            options.append("--" + name)
+            if value is not True:
+                options.append(str(value))
+        return options
+
+    def get_worker_command(self, start: int, end: int, segment_name: str) -> list[str]:
+        return [
+            sys.executable, "-m", "manimlib",
+            self.run_config.file_name, self.scene_class.__name__,
+            *self.get_worker_options(),
+            "--write_file",
+            "--quiet",
+            "--start_at_animation_number", f"{start},{end}",
+            "--file_name", segment_name,
+            "--video_dir", str(self.segment_directory),
+            "--parallel", "1",
+        ]
+
+    def render_segment(self, index: int, start: int, end: int) -> Path:
+        segment_name = f"segment_{index:03}"
+        process = sp.run(
+            self.get_worker_command(start, end, segment_name),
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            raise Exception(
+                f"Rendering animations {start} to {end} of {self} failed:\n{process.stderr}"
+            )
+        # Output directories may mirror the module path, so search for the file
+        return next(self.segment_directory.rglob(segment_name + self.movie_file_extension))
+
+    def concatenate_segments(self, segment_paths: list[Path]) -> None:
+        list_path = Path(self.segment_directory, "segments.txt")
+        with open(list_path, "w") as file:
+            for path in segment_paths:
+                file.write(f"file '{path.absolute()}'\n")
+        sp.run([
+            self.ffmpeg_bin,
+            '-y',  # overwrite output file if it exists
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', str(list_path),
+            '-c', 'copy',
+            '-loglevel', 'error',
+            str(self.movie_file_path),
+        ], check=True)
+
+    def run(self) -> None:
+        ranges = self.get_segment_ranges()
+        if len(ranges) <= 1:
+            # Nothing to split
+            self.scene_class(**self.scene_config).run()
+            return
+
+        guarantee_existence(self.segment_directory)
+        if not self.quiet:
+            log.info(f"Rendering {self} in {len(ranges)} processes")
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            segment_paths = list(executor.map(
+                self.render_segment,
+                range(len(ranges)),
+                *zip(*ranges),
+            ))
+        self.concatenate_segments(segment_paths)
+        shutil.rmtree(self.segment_directory)
+        if not self.quiet:
+            log.info(f"File ready at {self.movie_file_path}")
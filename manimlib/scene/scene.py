@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from collections import OrderedDict
+import inspect
 import platform
 import random
+import sys
 import time
 from functools import wraps
 from contextlib import contextmanager
@@ -29,10 +31,15 @@ from manimlib.mobject.types.vectorized_mobject import VMobject
 from manimlib.scene.scene_embed import InteractiveSceneEmbed
 from manimlib.scene.scene_embed import CheckpointManager
 from manimlib.scene.scene_file_writer import SceneFileWriter
+from manimlib.utils.cache import get_cached_value
+from manimlib.utils.cache import set_cached_value
 from manimlib.utils.dict_ops import merge_dicts_recursively
 from manimlib.utils.family_ops import extract_mobject_family_members
 from manimlib.utils.family_ops import recursive_mobject_remove
+from manimlib.utils.hashing import hash_objects
 from manimlib.utils.iterables import batch_by_property
+from manimlib.utils.profiling import PROFILER
+from manimlib.utils.simple_functions import hash_string
 from manimlib.window import Window
 
 from typing import TYPE_CHECKING
@@ -48,6 +55,10 @@ if TYPE_CHECKING:
     from manimlib.animation.animation import Animation
 
 
+# Tolerance used when comparing the scene's time to the time range being rendered
+TIME_EPSILON = 1e-6
+
+
 class Scene(object):
     random_seed: int = 0
     pan_sensitivity: float = 0.5
@@ -69,6 +80,9 @@ class Scene(object):
         always_update_mobjects: bool = False,
         start_at_animation_number: int | None = None,
         end_at_animation_number: int | None = None,
+        # Render only the frames from start_at_time up to end_at_time, in seconds
+        start_at_time: float | None = None,
+        end_at_time: float | None = None,
         show_animation_progress: bool = False,
         leave_progress_bars: bool = False,
         preview_while_skipping: bool = True,
@@ -79,6 +93,8 @@ class Scene(object):
         self.always_update_mobjects = always_update_mobjects
         self.start_at_animation_number = start_at_animation_number
         self.end_at_animation_number = end_at_animation_number
+        self.start_at_time = start_at_time
+        self.end_at_time = end_at_time
         self.show_animation_progress = show_animation_progress
         self.leave_progress_bars = leave_progress_bars
         self.preview_while_skipping = preview_while_skipping
@@ -102,11 +118,11 @@ class Scene(object):
             # Make sure camera and Pyglet window sync
             self.camera_config["fps"] = 30
 
-        # Core state of the scene
+        # Core state of the scene. The configuration may override the
+        # scene's samples, e.g. to turn off multisampling for drafts
         self.camera: Camera = Camera(
             window=self.window,
-            samples=self.samples,
-            **self.camera_config
+            **merge_dicts_recursively(dict(samples=self.samples), self.camera_config),
         )
         self.frame: CameraFrame = self.camera.frame
         self.frame.reorient(*self.default_frame_orientation)
@@ -119,11 +135,15 @@ class Scene(object):
         self.num_plays: int = 0
         self.time: float = 0
         self.skip_time: float = 0
+        # Scene time at the end of each play and wait call
+        self.play_end_times: list[float] = []
+        # Whether add_sound was called, even while skipping animations
+        self.adds_sound: bool = False
         self.original_skipping_status: bool = self.skip_animations
         self.undo_stack = []
         self.redo_stack = []
 
-        if self.start_at_animation_number is not None:
+        if self.start_at_animation_number is not None or self.start_at_time is not None:
             self.skip_animations = True
         if self.file_writer.has_progress_display():
             self.show_animation_progress = False
@@ -178,9 +198,52 @@ class Scene(object):
     def tear_down(self) -> None:
         self.stop_skipping()
         self.file_writer.finish()
+        if self.file_writer.write_to_movie and not self.file_writer.ended_with_interrupt:
+            self.record_total_frames()
         if self.window:
             self.window.destroy()
             self.window = None
+        else:
+            # Leave the headless context's framebuffers to later scenes
+            self.camera.release()
+
+    # Frame counts, for progress displays
+
+    def get_total_frames(self) -> int:
+        return round((self.time - self.skip_time) * self.camera.fps)
+
+    def get_timeline_key(self) -> str | None:
+        """
+        Identifies the code of the scene, along with the settings which
+        decide how many frames it writes, or returns None if the code
+        can't be found.
+        """
+        try:
+            source = inspect.getsource(sys.modules[type(self).__module__])
+        except (KeyError, OSError, TypeError):
+            return None
+        settings = (
+            type(self).__qualname__,
+            self.camera.fps,
+            self.start_at_animation_number,
+            self.end_at_animation_number,
+            self.start_at_time,
+            self.end_at_time,
+        )
+        return "scene_frames_" + hash_string(source + repr(settings))
+
+    def get_recorded_total_frames(self) -> int:
+        """
+        Number of frames written by the last complete render of this scene's
+        code, with the same settings, or 0 if there is no such render.
+        """
+        key = self.get_timeline_key()
+        return (key and get_cached_value(key)) or 0
+
+    def record_total_frames(self) -> None:
+        key = self.get_timeline_key()
+        if key is not None:
+            set_cached_value(key, self.get_total_frames())
 
     def interact(self) -> None:
         """
@@ -234,8 +297,11 @@ class Scene(object):
 
     def update_frame(self, dt: float = 0, force_draw: bool = False) -> None:
         self.increment_time(dt)
-        self.update_mobjects(dt)
-        if self.skip_animations and not force_draw:
+        if dt > 0 and self.is_past_end_time():
+            raise EndScene()
+        with PROFILER.time("update_mobjects"):
+            self.update_mobjects(dt)
+        if (self.skip_animations or self.is_before_start_time()) and not force_draw:
             return
 
         if self.is_window_closing():
@@ -247,7 +313,8 @@ class Scene(object):
             self.window._window.dispatch_events()
             return
 
-        self.camera.capture(*self.render_groups)
+        with PROFILER.time("capture"):
+            self.camera.capture(*self.render_groups)
 
         if self.window and not self.skip_animations:
             vt = self.time - self.virtual_animation_start_time
@@ -255,9 +322,30 @@ class Scene(object):
             time.sleep(max(vt - rt, 0))
 
     def emit_frame(self) -> None:
-        if not self.skip_animations:
+        if not self.skip_animations and not self.is_before_start_time():
             self.file_writer.write_frame(self.camera)
 
+    def emit_static_frames(self, time_progression: Iterable[float]) -> None:
+        """
+        Pass through a stretch of time in which nothing on screen changes,
+        rendering and reading back a single frame which is then written
+        once per time step.
+        """
+        last_t = 0
+        n_frames = 0
+        for t in time_progression:
+            dt = t - last_t
+            last_t = t
+            self.increment_time(dt)
+            if self.is_past_end_time():
+                self.increment_time(-dt)
+                break
+            if not self.is_before_start_time():
+                n_frames += 1
+        self.update_frame()
+        if not self.skip_animations:
+            self.file_writer.write_static_frames(self.camera, n_frames)
+
     # Related to updating
 
     def update_mobjects(self, dt: float) -> None:
@@ -269,6 +357,14 @@ class Scene(object):
             mob.has_updaters() for mob in self.mobjects
         )
 
+    def is_static(self) -> bool:
+        """
+        Whether every frame rendered from now on would be identical until
+        something is animated, i.e. there are no updaters and no window
+        whose events could change the scene.
+        """
+        return self.window is None and not self.should_update_mobjects()
+
     # Related to time
 
     def get_time(self) -> float:
@@ -441,7 +537,7 @@ class Scene(object):
 
     # Related to skipping
 
-    def update_skipping_status(self) -> None:
+    def update_skipping_status(self, run_time: float | None = None) -> None:
         if self.start_at_animation_number is not None:
             if self.num_plays == self.start_at_animation_number:
                 self.skip_time = self.time
@@ -450,6 +546,28 @@ class Scene(object):
         if self.end_at_animation_number is not None:
             if self.num_plays >= self.end_at_animation_number:
                 raise EndScene()
+        if self.start_at_time is not None and self.skip_animations and run_time is not None:
+            # Once an animation reaches the start time, step through it frame by
+            # frame, only drawing and writing frames from the start time on
+            if self.time + run_time > self.start_at_time + TIME_EPSILON:
+                self.skip_time = self.start_at_time
+                if not self.original_skipping_status:
+                    self.stop_skipping()
+        if self.has_reached_end_time():
+            raise EndScene()
+
+    # The frame drawn at time t shows the scene at the end of the step from
+    # t - 1 / fps to t, so, as for a full render, frames are written for
+    # times t in the half-open interval (start_at_time, end_at_time]
+    def is_before_start_time(self) -> bool:
+        return self.start_at_time is not None and self.time < self.start_at_time + TIME_EPSILON
+
+    def is_past_end_time(self) -> bool:
+        return self.end_at_time is not None and self.time > self.end_at_time + TIME_EPSILON
+
+    def has_reached_end_time(self) -> bool:
+        # At which point there are no more frames to write
+        return self.end_at_time is not None and self.time > self.end_at_time - TIME_EPSILON
 
     def stop_skipping(self) -> None:
         self.virtual_animation_start_time = self.time
@@ -510,20 +628,63 @@ class Scene(object):
             kw["override_skip_animations"] = True
         return self.get_time_progression(duration, **kw)
 
-    def pre_play(self):
+    def get_partial_movie_key(self, *cache_key_items) -> str | None:
+        """
+        Hash of everything determining the frames of the next animation:
+        the output settings, the current state of every mobject, and the
+        items passed in, such as the animations to be played. None if
+        some of it can't be hashed, in which case nothing is cached.
+        """
+        camera = self.camera
+        return hash_objects(
+            camera.get_pixel_shape(),
+            camera.fps,
+            camera.background_rgba,
+            camera.samples,
+            self.file_writer.get_encoding_settings(),
+            self.mobjects,
+            cache_key_items,
+        )
+
+    def can_reuse_partial_movies(self) -> bool:
+        # With updaters, skipping through an animation doesn't leave the scene
+        # exactly as rendering it would, and time ranges cut animations short
+        return all([
+            self.file_writer.cache_partial_movies,
+            not self.should_update_mobjects(),
+            self.start_at_time is None,
+            self.end_at_time is None,
+        ])
+
+    def pre_play(self, *cache_key_items, run_time: float | None = None):
         if self.presenter_mode and self.num_plays == 0:
             self.hold_loop()
 
-        self.update_skipping_status()
+        self.update_skipping_status(run_time)
+
+        if not self.skip_animations and run_time is not None:
+            # Without a recorded total, the progress display grows as animations begin
+            self.file_writer.extend_progress_display(
+                round((self.time + run_time - self.skip_time) * self.camera.fps)
+            )
 
         if not self.skip_animations:
-            self.file_writer.begin_animation()
+            cache_key = None
+            if cache_key_items and self.can_reuse_partial_movies():
+                cache_key = self.get_partial_movie_key(*cache_key_items)
+            self.file_writer.begin_animation(cache_key)
+            if self.file_writer.reusing_partial_movie:
+                # Its movie is already on file, so the animation only needs
+                # to take effect on the scene
+                self.skip_animations = True
 
         if self.window:
             self.virtual_animation_start_time = self.time
             self.real_animation_start_time = time.time()
 
     def post_play(self):
+        if self.file_writer.reusing_partial_movie:
+            self.skip_animations = False
         if not self.skip_animations:
             self.file_writer.end_animation()
 
@@ -531,6 +692,7 @@ class Scene(object):
             # Show some quick frames along the way
             self.update_frame(dt=0, force_draw=True)
 
+        self.play_end_times.append(self.time)
         self.num_plays += 1
 
     def begin_animations(self, animations: Iterable[Animation]) -> None:
@@ -551,10 +713,11 @@ class Scene(object):
         for t in self.get_animation_time_progression(animations):
             dt = t - last_t
             last_t = t
-            for animation in animations:
-                animation.update_mobjects(dt)
-                alpha = t / animation.run_time
-                animation.interpolate(alpha)
+            with PROFILER.time("interpolate"):
+                for animation in animations:
+                    animation.update_mobjects(dt)
+                    alpha = t / animation.run_time
+                    animation.interpolate(alpha)
             self.update_frame(dt)
             self.emit_frame()
 
@@ -581,7 +744,8 @@ class Scene(object):
         animations = list(map(prepare_animation, proto_animations))
         for anim in animations:
             anim.update_rate_info(run_time, rate_func, lag_ratio)
-        self.pre_play()
+        PROFILER.set_animation(f"{self.num_plays}: {', '.join(map(str, animations))}")
+        self.pre_play(*animations, run_time=self.get_run_time(animations))
         self.begin_animations(animations)
         self.progress_through_animations(animations)
         self.finish_animations(animations)
@@ -596,7 +760,11 @@ class Scene(object):
     ):
         if duration is None:
             duration = self.default_wait_time
-        self.pre_play()
+        PROFILER.set_animation(f"{self.num_plays}: Wait")
+        if stop_condition is None and not self.presenter_mode:
+            self.pre_play("wait", duration, run_time=duration)
+        else:
+            self.pre_play(run_time=duration)
         self.update_mobjects(dt=0)  # Any problems with this?
         if self.presenter_mode and not self.skip_animations and not ignore_presenter_mode:
             if note:
@@ -604,14 +772,17 @@ class Scene(object):
             self.hold_loop()
         else:
             time_progression = self.get_wait_time_progression(duration, stop_condition)
-            last_t = 0
-            for t in time_progression:
-                dt = t - last_t
-                last_t = t
-                self.update_frame(dt)
-                self.emit_frame()
-                if stop_condition is not None and stop_condition():
-                    break
+            if stop_condition is None and not self.skip_animations and self.is_static():
+                self.emit_static_frames(time_progression)
+            else:
+                last_t = 0
+                for t in time_progression:
+                    dt = t - last_t
+                    last_t = t
+                    self.update_frame(dt)
+                    self.emit_frame()
+                    if stop_condition is not None and stop_condition():
+                        break
         self.post_play()
 
     def hold_loop(self):
@@ -643,6 +814,7 @@ class Scene(object):
         gain: float | None = None,
         gain_to_background: float | None = None
     ):
+        self.adds_sound = True
         if self.skip_animations:
             return
         time = self.get_time() + time_offset
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import os
 import platform
+import queue
 import shutil
 import subprocess as sp
 import sys
+import threading
 
 import numpy as np
 from pydub import AudioSegment
@@ -14,6 +16,7 @@ from pathlib import Path
 from manimlib.logger import log
 from manimlib.mobject.mobject import Mobject
 from manimlib.utils.file_ops import guarantee_existence
+from manimlib.utils.profiling import PROFILER
 from manimlib.utils.sounds import get_full_sound_file_path
 
 from typing import TYPE_CHECKING
@@ -48,6 +51,26 @@ class SceneFileWriter(object):
         pixel_format: str = "yuv420p",
         saturation: float = 1.0,
         gamma: float = 1.0,
+        # Encoder options, left to ffmpeg's defaults when empty
+        video_preset: str = "",
+        crf: int | None = None,
+        tune: str = "",
+        threads: int = 0,
+        # Flip frames and convert them to yuv420p on the GPU, rather than
+        # in ffmpeg, when writing yuv420p video
+        gpu_yuv_conversion: bool = False,
+        # Frames are handed to ffmpeg by a separate thread, through a queue
+        # holding at most this many frames. When it's full, rendering waits
+        # for ffmpeg to catch up. Set to 0 to write on the render thread.
+        frame_queue_size: int = 8,
+        # Write each animation to its own partial movie, stored under a hash
+        # of the scene's state and the animation, so that animations which are
+        # unchanged since a previous run are copied rather than rendered.
+        # The partial movies are then joined into the movie file.
+        cache_partial_movies: bool = False,
+        # Least recently used partial movies are deleted from the cache
+        # to keep it under this many megabytes
+        partial_movie_cache_max_mb: float = 1000,
     ):
         self.scene: Scene = scene
         self.write_to_movie = write_to_movie
@@ -67,9 +90,23 @@ class SceneFileWriter(object):
         self.pixel_format = pixel_format
         self.saturation = saturation
         self.gamma = gamma
+        self.video_preset = video_preset
+        self.crf = crf
+        self.tune = tune
+        self.threads = threads
+        self.gpu_yuv_conversion = gpu_yuv_conversion
+        self.frame_queue_size = frame_queue_size
+        self.cache_partial_movies = cache_partial_movies
+        self.partial_movie_cache_max_mb = partial_movie_cache_max_mb
 
         # State during file writing
         self.writing_process: sp.Popen | None = None
+        self.frame_queue: queue.Queue | None = None
+        self.frame_writer: threading.Thread | None = None
+        self.frame_writer_error: Exception | None = None
+        self.partial_movie_paths: list[Path] = []
+        self.partial_movie_key: str | None = None
+        self.reusing_partial_movie: bool = False
         self.progress_display: ProgressDisplay | None = None
         self.ended_with_interrupt: bool = False
 
@@ -82,8 +119,12 @@ class SceneFileWriter(object):
             self.image_file_path = self.init_image_file_path()
         if self.write_to_movie:
             self.movie_file_path = self.init_movie_file_path()
-        if self.subdivide_output:
+        if self.uses_partial_movies():
             self.partial_movie_directory = self.init_partial_movie_directory()
+        if self.cache_partial_movies:
+            self.partial_movie_cache_directory = guarantee_existence(
+                Path(self.output_directory, "partial_movie_cache")
+            )
 
     def init_image_file_path(self) -> Path:
         return self.get_output_file_rootname().with_suffix(".png")
@@ -112,6 +153,10 @@ class SceneFileWriter(object):
             name += f"_{saan}"
         if eaan is not None:
             name += f"_{eaan}"
+        if self.scene.start_at_time is not None:
+            name += f"_from_{self.scene.start_at_time:g}s"
+        if self.scene.end_at_time is not None:
+            name += f"_to_{self.scene.end_at_time:g}s"
         return name
 
     # Directory getters
@@ -125,6 +170,18 @@ class SceneFileWriter(object):
     def get_movie_file_path(self) -> str:
         return self.movie_file_path
 
+    def get_cached_partial_movie_path(self, key: str) -> Path:
+        return Path(self.partial_movie_cache_directory, key).with_suffix(self.movie_file_extension)
+
+    def uses_partial_movies(self) -> bool:
+        return self.subdivide_output or self.cache_partial_movies
+
+    def get_encoding_settings(self) -> tuple:
+        return (
+            self.movie_file_extension, self.video_codec, self.pixel_format,
+            self.video_preset, self.crf, self.tune, self.saturation, self.gamma,
+        )
+
     # Sound
     def init_audio(self) -> None:
         self.includes_sound: bool = False
@@ -176,20 +233,85 @@ class SceneFileWriter(object):
 
     # Writers
     def begin(self) -> None:
-        if not self.subdivide_output and self.write_to_movie:
+        if not self.uses_partial_movies() and self.write_to_movie:
             self.open_movie_pipe(self.get_movie_file_path())
 
-    def begin_animation(self) -> None:
-        if self.subdivide_output and self.write_to_movie:
-            self.open_movie_pipe(self.get_next_partial_movie_path())
+    def begin_animation(self, cache_key: str | None = None) -> None:
+        """
+        Start the partial movie of an animation. If cache_key is given and a
+        movie with that key is cached, it's copied in instead, and
+        reusing_partial_movie is set for the duration of the animation.
+        """
+        if not (self.uses_partial_movies() and self.write_to_movie):
+            return
+        file_path = self.get_next_partial_movie_path()
+        self.partial_movie_paths.append(file_path)
+        self.partial_movie_key = cache_key
+        cached_path = None if cache_key is None else self.get_cached_partial_movie_path(cache_key)
+        if cached_path is not None and cached_path.exists():
+            shutil.copyfile(cached_path, file_path)
+            # Mark it as recently used, for prune_partial_movie_cache
+            os.utime(cached_path)
+            self.reusing_partial_movie = True
+        else:
+            self.open_movie_pipe(file_path)
 
     def end_animation(self) -> None:
-        if self.subdivide_output and self.write_to_movie:
-            self.close_movie_pipe()
+        if not (self.uses_partial_movies() and self.write_to_movie):
+            return
+        if self.reusing_partial_movie:
+            self.reusing_partial_movie = False
+            return
+        self.close_movie_pipe()
+        if self.partial_movie_key is not None and not self.ended_with_interrupt:
+            shutil.copyfile(self.final_file_path, self.get_cached_partial_movie_path(self.partial_movie_key))
+            self.prune_partial_movie_cache()
+
+    def prune_partial_movie_cache(self) -> None:
+        """
+        Delete the least recently used partial movies until the cache
+        fits within partial_movie_cache_max_mb.
+        """
+        paths = sorted(
+            Path(self.partial_movie_cache_directory).iterdir(),
+            key=lambda path: path.stat().st_mtime,
+        )
+        sizes = [path.stat().st_size for path in paths]
+        total = sum(sizes)
+        max_bytes = self.partial_movie_cache_max_mb * 1024 * 1024
+        for path, size in zip(paths, sizes):
+            if total <= max_bytes:
+                break
+            path.unlink()
+            total -= size
+
+    def combine_partial_movies(self) -> None:
+        if not self.partial_movie_paths:
+            return
+        list_path = Path(self.partial_movie_directory, "partial_movies.txt")
+        with open(list_path, "w") as file:
+            for path in self.partial_movie_paths:
+                file.write(f"file '{Path(path).absolute()}'\n")
+        sp.run([
+            self.ffmpeg_bin,
+            '-y',  # overwrite output file if it exists
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', str(list_path),
+            '-c', 'copy',
+            '-loglevel', 'error',
+            str(self.get_movie_file_path()),
+        ], check=True)
 
     def finish(self) -> None:
+        if self.uses_partial_movies() and self.write_to_movie and self.is_writing_movie():
+            # The scene ended partway through an animation
+            self.end_animation()
         if not self.subdivide_output and self.write_to_movie:
-            self.close_movie_pipe()
+            if self.cache_partial_movies:
+                self.combine_partial_movies()
+            else:
+                self.close_movie_pipe()
             if self.includes_sound:
                 self.add_sound_to_video()
             self.print_file_ready_message(self.get_movie_file_path())
@@ -204,30 +326,51 @@ class SceneFileWriter(object):
         self.final_file_path = file_path
         self.temp_file_path = stem + "_temp" + ext
 
-        fps = self.scene.camera.fps
-        width, height = self.scene.camera.get_pixel_shape()
+        camera = self.scene.camera
+        fps = camera.fps
+        width, height = camera.get_pixel_shape()
+
+        use_yuv = all([
+            self.gpu_yuv_conversion,
+            self.video_codec,
+            self.pixel_format == "yuv420p",
+            camera.supports_yuv_readback(),
+        ])
+        camera.use_yuv_readback(use_yuv)
 
-        vf_arg = 'vflip'
-        vf_arg += f',eq=saturation={self.saturation}:gamma={self.gamma}'
+        filters = [] if use_yuv else ['vflip']
+        if self.saturation != 1.0 or self.gamma != 1.0:
+            filters.append(f'eq=saturation={self.saturation}:gamma={self.gamma}')
 
         command = [
             self.ffmpeg_bin,
             '-y',  # overwrite output file if it exists
             '-f', 'rawvideo',
             '-s', f'{width}x{height}',  # size of one frame
-            '-pix_fmt', 'rgba',
+            '-pix_fmt', 'yuv420p' if use_yuv else 'rgba',
             '-r', str(fps),  # frames per second
             '-i', '-',  # The input comes from a pipe
-            '-vf', vf_arg,
             '-an',  # Tells ffmpeg not to expect any audio
             '-loglevel', 'error',
         ]
+        if filters:
+            command += ['-vf', ','.join(filters)]
         if self.video_codec:
             command += ['-vcodec', self.video_codec]
         if self.pixel_format:
             command += ['-pix_fmt', self.pixel_format]
+        if self.video_preset:
+            command += ['-preset', self.video_preset]
+        if self.crf is not None:
+            command += ['-crf', str(self.crf)]
+        if self.tune:
+            command += ['-tune', self.tune]
+        if self.threads:
+            command += ['-threads', str(self.threads)]
         command += [self.temp_file_path]
         self.writing_process = sp.Popen(command, stdin=sp.PIPE)
+        if self.frame_queue_size > 0:
+            self.start_frame_writer()
 
         if not self.quiet:
             self.progress_display = ProgressDisplay(
@@ -238,6 +381,9 @@ class SceneFileWriter(object):
             )
             self.set_progress_display_description()
 
+    def is_writing_movie(self) -> bool:
+        return self.writing_process is not None and not self.writing_process.stdin.closed
+
     def use_fast_encoding(self):
         self.video_codec = "libx264rgb"
         self.pixel_format = "rgb32"
@@ -264,6 +410,17 @@ class SceneFileWriter(object):
         self.write_to_movie = False
         self.print_file_ready_message(self.inserted_file_path)
 
+    def extend_progress_display(self, total_frames: int) -> None:
+        """
+        Make sure the progress display for the whole scene
+        counts up to at least total_frames
+        """
+        display = self.progress_display
+        if display is None or self.uses_partial_movies() or display.total >= total_frames:
+            return
+        display.total = total_frames
+        display.refresh()
+
     def has_progress_display(self):
         return self.progress_display is not None
 
@@ -283,18 +440,112 @@ class SceneFileWriter(object):
 
     def write_frame(self, camera: Camera) -> None:
         if self.write_to_movie:
-            raw_bytes = camera.get_raw_fbo_data()
-            self.writing_process.stdin.write(raw_bytes)
-            if self.progress_display is not None:
-                self.progress_display.update()
+            # Readback is asynchronous, so this may be the data of an
+            # earlier frame, or nothing yet
+            with PROFILER.time("readback"):
+                raw_bytes = camera.queue_raw_fbo_data()
+            if raw_bytes is not None:
+                self.write_raw_frame(raw_bytes)
+
+    def write_static_frames(self, camera: Camera, n_frames: int) -> None:
+        """
+        Write the camera's current frame n_frames times, reading it back
+        from the GPU only once.
+        """
+        if not self.write_to_movie or n_frames <= 0:
+            return
+        # Collect the frames still in flight, the last of which is the current one
+        raw_frames = [camera.queue_raw_fbo_data(), *camera.flush_raw_fbo_data()]
+        raw_frames = [raw_bytes for raw_bytes in raw_frames if raw_bytes is not None]
+        for raw_bytes in raw_frames:
+            self.write_raw_frame(raw_bytes)
+        for _ in range(n_frames - 1):
+            self.write_raw_frame(raw_frames[-1])
+
+    def write_raw_frame(self, raw_bytes: bytes) -> None:
+        if self.frame_queue is None:
+            with PROFILER.time("pipe_write"):
+                self.writing_process.stdin.write(raw_bytes)
+        else:
+            if self.frame_writer_error is not None:
+                raise self.frame_writer_error
+            occupancy = self.frame_queue.qsize()
+            stats = self.frame_queue_stats
+            stats["frames"] += 1
+            stats["total_occupancy"] += occupancy
+            stats["max_occupancy"] = max(stats["max_occupancy"], occupancy)
+            if occupancy >= self.frame_queue_size:
+                stats["blocked"] += 1
+            with PROFILER.time("frame_queue_put"):
+                self.frame_queue.put(raw_bytes)
+        if self.progress_display is not None:
+            self.progress_display.update()
+
+    def start_frame_writer(self) -> None:
+        self.frame_queue = queue.Queue(maxsize=self.frame_queue_size)
+        self.frame_queue_stats = dict(frames=0, total_occupancy=0, max_occupancy=0, blocked=0)
+        self.frame_writer_error = None
+        self.frame_writer = threading.Thread(
+            target=self.write_queued_frames,
+            args=(self.writing_process.stdin, self.frame_queue),
+            daemon=True,
+        )
+        self.frame_writer.start()
+
+    def write_queued_frames(self, pipe, frame_queue: queue.Queue) -> None:
+        # Runs on the frame writer thread. Pipe writes release the GIL,
+        # so the render thread carries on while ffmpeg consumes frames.
+        while (raw_bytes := frame_queue.get()) is not None:
+            if self.frame_writer_error is not None:
+                # Keep draining, so the render thread never blocks on a
+                # queue nobody reads; it raises the error on its next frame
+                continue
+            try:
+                with PROFILER.time("pipe_write"):
+                    pipe.write(raw_bytes)
+            except Exception as e:
+                self.frame_writer_error = e
+
+    def stop_frame_writer(self) -> None:
+        self.frame_queue.put(None)
+        self.frame_writer.join()
+        self.frame_queue = None
+        self.frame_writer = None
+
+        stats = self.frame_queue_stats
+        if stats["frames"] > 0:
+            log.debug(
+                f"Frame queue: average occupancy {stats['total_occupancy'] / stats['frames']:.1f}"
+                f" of {self.frame_queue_size}, max {stats['max_occupancy']},"
+                f" rendering waited on ffmpeg for {stats['blocked']} of {stats['frames']} frames"
+            )
 
     def close_movie_pipe(self) -> None:
-        self.writing_process.stdin.close()
-        self.writing_process.wait()
-        self.writing_process.terminate()
-        if self.progress_display is not None:
-            self.progress_display.close()
+        # If writing frames failed, ffmpeg is still shut down and its
+        # partial output removed before the error is raised
+        error = None
+        try:
+            for raw_bytes in self.scene.camera.flush_raw_fbo_data():
+                self.write_raw_frame(raw_bytes)
+        except Exception as e:
+            error = e
+        finally:
+            if self.frame_writer is not None:
+                self.stop_frame_writer()
+                error = error or self.frame_writer_error
+            try:
+                self.writing_process.stdin.close()
+            except BrokenPipeError as e:
+                error = error or e
+            self.writing_process.wait()
+            self.writing_process.terminate()
+            if self.progress_display is not None:
+                self.progress_display.close()
 
+        if error is not None:
+            if os.path.exists(self.temp_file_path):
+                os.remove(self.temp_file_path)
+            raise error
         if not self.ended_with_interrupt:
             shutil.move(self.temp_file_path, self.final_file_path)
         else:
@@ -411,11 +411,12 @@ class VShaderWrapper(ShaderWrapper):
         along with the rgb value which is meant to be discarded.
         """
         size = manim_config.camera.resolution
-        double_size = (2 * size[0], 2 * size[1])
+        scale = manim_config.vmobject.fill_canvas_scale
+        canvas_size = (scale * size[0], scale * size[1])
 
         # Important to make sure dtype is floating point (not fixed point)
         # so that alpha values can be negative and are not clipped
-        fill_texture = ctx.texture(size=double_size, components=4, dtype='f2')
+        fill_texture = ctx.texture(size=canvas_size, components=4, dtype='f2')
         # Use another one to keep track of depth
         depth_texture = ctx.texture(size=size, components=1, dtype='f4')
 
@@ -11,6 +11,8 @@ from manimlib.utils.simple_functions import hash_string
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from typing import Any, Callable, TypeVar
+
     T = TypeVar('T')
 
 
@@ -30,5 +32,13 @@ def cache_on_disk(func: Callable[..., T]) -> Callable[..., T]:
     return wrapper
 
 
+def get_cached_value(key: str) -> Any:
+    return _cache.get(key)
+
+
+def set_cached_value(key: str, value: Any) -> None:
+    _cache.set(key, value)
+
+
 def clear_cache():
     _cache.clear()
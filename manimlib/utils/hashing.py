@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import types
+
+import numpy as np
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Optional
+
+
+# Attributes of arbitrary objects are followed this many levels deep.
+# Objects nested deeper than this make their hash unavailable
+MAX_HASH_DEPTH = 12
+
+
+class UnhashableObject(Exception):
+    """Raised for objects whose content can't be told apart by hashing"""
+
+
+def hash_objects(*objects: Any) -> Optional[str]:
+    """
+    Hash the content of the given objects, e.g. the mobjects of a scene
+    and the animations about to be played, such that equal content gives
+    an equal hash across runs. Returns None if any part of them can't be
+    hashed by content, e.g. objects nested too deeply, so that different
+    content never shares a hash.
+    """
+    hasher = hashlib.sha256()
+    try:
+        for obj in objects:
+            _update_hash(hasher, obj, 0, set())
+    except UnhashableObject:
+        return None
+    return hasher.hexdigest()
+
+
+def _get_digest(obj: Any, depth: int, seen: set[int]) -> bytes:
+    # For unordered collections, whose members are hashed independently
+    # and sorted, so that the result doesn't depend on iteration order
+    hasher = hashlib.sha256()
+    _update_hash(hasher, obj, depth, set(seen))
+    return hasher.digest()
+
+
+def _update_hash(hasher, obj: Any, depth: int, seen: set[int]) -> None:
+    # Imported here to avoid a circular import
+    from manimlib.mobject.mobject import Mobject
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        hasher.update(repr(obj).encode())
+        return
+    if isinstance(obj, np.ndarray):
+        hasher.update(f"{obj.dtype}{obj.shape}".encode())
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+        return
+    if isinstance(obj, np.generic):
+        hasher.update(repr(obj.item()).encode())
+        return
+    if isinstance(obj, (types.ModuleType, type, types.BuiltinFunctionType, np.ufunc)):
+        # Identified by where they're defined
+        hasher.update(f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', obj.__name__)}".encode())
+        return
+
+    hasher.update(type(obj).__qualname__.encode())
+    if id(obj) in seen:
+        return
+    if depth > MAX_HASH_DEPTH:
+        raise UnhashableObject(f"{type(obj).__qualname__} is nested too deeply")
+    seen.add(id(obj))
+
+    def update(value):
+        _update_hash(hasher, value, depth + 1, seen)
+
+    if isinstance(obj, Mobject):
+        for mob in obj.get_family():
+            hasher.update(type(mob).__qualname__.encode())
+            # Fields derived from the rest when rendering are left out,
+            # as they're only filled in once a mobject is drawn
+            keys = [key for key in mob.data.dtype.names if key not in mob.derived_data_keys]
+            for key in keys:
+                update(key)
+                update(mob.data[key])
+            update(mob.uniforms)
+            update(mob.shader_code_replacements)
+            update(mob.texture_paths)
+            update((mob.depth_test, mob.z_index, len(mob.submobjects)))
+            update(mob.updaters)
+    elif isinstance(obj, dict):
+        for digest in sorted(
+            _get_digest((key, value), depth + 1, seen)
+            for key, value in obj.items()
+        ):
+            hasher.update(digest)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            update(value)
+    elif isinstance(obj, (set, frozenset)):
+        for digest in sorted(_get_digest(value, depth + 1, seen) for value in obj):
+            hasher.update(digest)
+    elif isinstance(obj, types.CodeType):
+        hasher.update(obj.co_code)
+        update(obj.co_consts)
+    elif hasattr(obj, "__code__"):
+        # Functions, e.g. rate functions and updaters, are identified by
+        # their code, whatever they close over, and the module level
+        # values they refer to, other than modules and classes
+        update(obj.__code__)
+        update(getattr(obj, "__defaults__", None))
+        for cell in getattr(obj, "__closure__", None) or ():
+            try:
+                update(cell.cell_contents)
+            except ValueError:
+                pass
+        module_globals = getattr(obj, "__globals__", {})
+        for name in sorted(_get_referenced_names(obj.__code__)):
+            value = module_globals.get(name)
+            if name in module_globals and not isinstance(value, (types.ModuleType, type)):
+                update(name)
+                update(value)
+    elif hasattr(obj, "__func__"):
+        # Bound methods
+        update(obj.__func__)
+        update(obj.__self__)
+    elif isinstance(obj, functools.partial):
+        update((obj.func, obj.args, obj.keywords))
+    elif isinstance(obj, os.PathLike):
+        update(os.fspath(obj))
+    elif hasattr(obj, "__dict__"):
+        update(vars(obj))
+    elif hasattr(type(obj), "__slots__"):
+        update([
+            getattr(obj, name, None)
+            for cls in type(obj).__mro__
+            for name in _get_slot_names(cls)
+        ])
+    else:
+        raise UnhashableObject(f"Can't hash the content of {type(obj).__qualname__}")
+
+
+def _get_referenced_names(code: types.CodeType) -> set[str]:
+    # Names used by the code, including those of functions defined within it
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _get_referenced_names(const)
+    return names
+
+
+def _get_slot_names(cls: type) -> tuple[str, ...]:
+    slots = getattr(cls, "__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import ContextManager
+
+    from manimlib.mobject.mobject import Mobject
+
+
+class Profiler(object):
+    """
+    Opt-in timing of the stages of rendering a scene. Stages are timed with
+
+        with PROFILER.time("stage"):
+            ...
+
+    which costs next to nothing while the profiler is disabled. Totals are
+    kept per stage, per animation and per mobject type, and every timed
+    interval is recorded as an event of a Chrome trace, up to max_trace_events.
+    """
+    def __init__(self, max_trace_events: int = 1_000_000):
+        self.enabled = False
+        self.max_trace_events = max_trace_events
+        # Stages are recorded from both the main thread and the thread
+        # writing frames, so updates to the stats go through this
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.start_time = time.perf_counter()
+        self.animation = "setup"
+        # Frames are written on their own thread, so the mobject
+        # being rendered is tracked per thread
+        self.thread_state = threading.local()
+        self.trace_events: list[dict] = []
+        self.n_dropped_events = 0
+        # Each maps a stage to [count, total seconds]
+        self.stage_stats = defaultdict(lambda: [0, 0.0])
+        self.animation_stats = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+        self.mobject_stats = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+
+    def enable(self) -> None:
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def set_animation(self, label: str) -> None:
+        """Attribute the stages timed from now on to the given animation"""
+        self.animation = label
+
+    def time(self, stage: str, mobject: Mobject | None = None) -> ContextManager:
+        """
+        Time the enclosed block as the given stage. If a mobject is given,
+        the stage and those nested within it are attributed to its type.
+        """
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, stage, None if mobject is None else get_mobject_type(mobject))
+
+    @property
+    def mobject_type(self) -> str | None:
+        return getattr(self.thread_state, "mobject_type", None)
+
+    @mobject_type.setter
+    def mobject_type(self, mobject_type: str | None) -> None:
+        self.thread_state.mobject_type = mobject_type
+
+    def record(self, stage: str, start: float, end: float) -> None:
+        duration = end - start
+        mobject_type = self.mobject_type
+        with self.lock:
+            for stats in [
+                self.stage_stats[stage],
+                self.animation_stats[self.animation][stage],
+                *([self.mobject_stats[mobject_type][stage]] if mobject_type else []),
+            ]:
+                stats[0] += 1
+                stats[1] += duration
+
+            if len(self.trace_events) >= self.max_trace_events:
+                self.n_dropped_events += 1
+                return
+            self.trace_events.append(dict(
+                name=stage,
+                cat=mobject_type or "scene",
+                ph="X",
+                ts=1e6 * (start - self.start_time),
+                dur=1e6 * duration,
+                pid=os.getpid(),
+                tid=threading.get_ident(),
+                args=dict(animation=self.animation),
+            ))
+
+    def get_report(self) -> dict:
+        def summarize(stats):
+            return {
+                stage: dict(
+                    count=count,
+                    total_seconds=total,
+                    mean_ms=1000 * total / count,
+                )
+                for stage, (count, total) in sorted(stats.items(), key=lambda item: -item[1][1])
+            }
+
+        with self.lock:
+            return dict(
+                wall_seconds=time.perf_counter() - self.start_time,
+                stages=summarize(self.stage_stats),
+                animations={
+                    label: summarize(stats)
+                    for label, stats in self.animation_stats.items()
+                },
+                mobject_types={
+                    name: summarize(stats)
+                    for name, stats in self.mobject_stats.items()
+                },
+                dropped_trace_events=self.n_dropped_events,
+            )
+
+    def write_report(self, file_root: str) -> tuple[str, str]:
+        """
+        Write the report to <file_root>.json and the Chrome trace, which can
+        be opened in chrome://tracing or Perfetto, to <file_root>_trace.json.
+        Returns both paths.
+        """
+        report_path = file_root + ".json"
+        trace_path = file_root + "_trace.json"
+        with open(report_path, "w") as file:
+            json.dump(self.get_report(), file, indent=2)
+        with self.lock:
+            trace_events = list(self.trace_events)
+        with open(trace_path, "w") as file:
+            json.dump(dict(traceEvents=trace_events, displayTimeUnit="ms"), file)
+        return report_path, trace_path
+
+
+def get_mobject_type(mobject: Mobject) -> str:
+    # Scenes render groups of mobjects sharing a shader, which
+    # are better described by the type of what they hold
+    if type(mobject).__name__ in ("Group", "VGroup") and mobject.submobjects:
+        mobject = mobject.submobjects[0]
+    return type(mobject).__name__
+
+
+class _Timer(object):
+    def __init__(self, profiler: Profiler, stage: str, mobject_type: str | None):
+        self.profiler = profiler
+        self.stage = stage
+        self.mobject_type = mobject_type
+
+    def __enter__(self):
+        if self.mobject_type is not None:
+            self.outer_mobject_type = self.profiler.mobject_type
+            self.profiler.mobject_type = self.mobject_type
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.stage, self.start, time.perf_counter())
+        if self.mobject_type is not None:
+            self.profiler.mobject_type = self.outer_mobject_type
+
+
+NULL_TIMER = nullcontext()
+
+# Shared by everything in the process, enabled with --profile
+PROFILER = Profiler()
@@ -0,0 +1,261 @@
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+from diskcache import Cache
+
+# Extracted text is cached per (file hash, page), so a PDF is only parsed once
+PDF_CACHE_DIR = os.getenv(
+    "PDF_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "tta_pdf_pages"),
+)
+PDF_CACHE_SIZE = 2e8  # 200 MB
+# Documents with at least this many uncached pages are parsed in a process pool
+PARALLEL_PAGE_THRESHOLD = 50
+PAGES_PER_TASK = 10
+# Paragraphs longer than this are split into several chunks
+MAX_CHUNK_CHARS = 1500
+# Rough conversion used to keep the context within a token budget
+CHARS_PER_TOKEN = 4
+DEFAULT_CONTEXT_TOKENS = 12500
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = Cache(
+            PDF_CACHE_DIR,
+            size_limit=int(PDF_CACHE_SIZE),
+            eviction_policy="least-recently-used",
+        )
+    return _cache
+
+
+def get_file_hash(file_path):
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _extract_page_range(pdf_path, start, stop):
+    # Module level, so that it can be sent to worker processes
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def get_num_pages(pdf_path, file_hash):
+    key = (file_hash, "num_pages")
+    num_pages = get_cache().get(key)
+    if num_pages is None:
+        with open(pdf_path, "rb") as file:
+            num_pages = len(PyPDF2.PdfReader(file).pages)
+        get_cache().set(key, num_pages)
+    return num_pages
+
+
+def iter_pdf_pages(pdf_path, max_workers=None, file_hash=None):
+    """
+    Yield the text of each page of a PDF, in order, as soon as it is available.
+
+    Pages already in the cache are not parsed again. If many pages are
+    missing, they are extracted in batches in a process pool.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        max_workers (int, optional): Processes used for large documents.
+        file_hash (str, optional): sha256 of the file, if already known.
+
+    Yields:
+        tuple of (int, str): Page number, starting at 1, and its text.
+    """
+    cache = get_cache()
+    file_hash = file_hash or get_file_hash(pdf_path)
+    num_pages = get_num_pages(pdf_path, file_hash)
+
+    texts = [cache.get((file_hash, i)) for i in range(num_pages)]
+    missing = [i for i, text in enumerate(texts) if text is None]
+
+    if len(missing) >= PARALLEL_PAGE_THRESHOLD:
+        ranges = [
+            (start, min(start + PAGES_PER_TASK, num_pages))
+            for start in range(0, num_pages, PAGES_PER_TASK)
+            if any(texts[i] is None for i in range(start, min(start + PAGES_PER_TASK, num_pages)))
+        ]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                start: executor.submit(_extract_page_range, pdf_path, start, stop)
+                for start, stop in ranges
+            }
+            for i in range(num_pages):
+                if texts[i] is None:
+                    start = i - i % PAGES_PER_TASK
+                    texts[i] = futures[start].result()[i - start]
+                    cache.set((file_hash, i), texts[i])
+                yield i + 1, texts[i]
+        return
+
+    reader = None
+    file = None
+    try:
+        for i in range(num_pages):
+            if texts[i] is None:
+                if reader is None:
+                    file = open(pdf_path, "rb")
+                    reader = PyPDF2.PdfReader(file)
+                texts[i] = reader.pages[i].extract_text() or ""
+                cache.set((file_hash, i), texts[i])
+            yield i + 1, texts[i]
+    finally:
+        if file is not None:
+            file.close()
+
+
+def split_into_chunks(pages):
+    """
+    Split page texts into paragraph sized chunks.
+
+    Args:
+        pages (iterable of (int, str)): Page numbers and texts.
+
+    Returns:
+        list of (int, str): Page number and text of each chunk, in document order.
+    """
+    chunks = []
+    for page_num, text in pages:
+        for paragraph in re.split(r"\n\s*\n", text):
+            paragraph = paragraph.strip()
+            for start in range(0, len(paragraph), MAX_CHUNK_CHARS):
+                chunks.append((page_num, paragraph[start:start + MAX_CHUNK_CHARS]))
+    return chunks
+
+
+def tokenize(text):
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class BM25Index:
+    """
+    Okapi BM25 index over the chunks of a document, used to find the
+    passages most relevant to a query.
+    """
+
+    def __init__(self, chunks, k1=1.5, b=0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(text)) for page_num, text in chunks]
+        self.lengths = [sum(freqs.values()) for freqs in self.term_freqs]
+        self.avg_length = sum(self.lengths) / max(len(self.lengths), 1)
+
+        doc_freqs = Counter()
+        for freqs in self.term_freqs:
+            doc_freqs.update(freqs.keys())
+        n = len(chunks)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+
+    def get_scores(self, query):
+        terms = [term for term in set(tokenize(query)) if term in self.idf]
+        scores = []
+        for freqs, length in zip(self.term_freqs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1))
+            scores.append(sum(
+                self.idf[term] * freqs[term] * (self.k1 + 1) / (freqs[term] + norm)
+                for term in terms
+                if term in freqs
+            ))
+        return scores
+
+    def search(self, query, top_k):
+        """Return (index, score) of the top_k chunks matching the query, best first."""
+        scores = self.get_scores(query)
+        ranked = sorted(range(len(scores)), key=lambda i: -scores[i])
+        return [(i, scores[i]) for i in ranked[:top_k] if scores[i] > 0]
+
+
+def get_pdf_index(pdf_path, max_workers=None):
+    """Return the BM25 index of a PDF, building it only the first time the file is seen."""
+    file_hash = get_file_hash(pdf_path)
+    key = (file_hash, "bm25", MAX_CHUNK_CHARS)
+    index = get_cache().get(key)
+    if index is None:
+        chunks = split_into_chunks(iter_pdf_pages(pdf_path, max_workers, file_hash))
+        index = BM25Index(chunks)
+        get_cache().set(key, index)
+    return index
+
+
+def select_chunks(chunks, scores, max_chars):
+    """
+    Pick the highest scoring chunks that fit within max_chars, and return
+    them in document order. Ties keep earlier chunks first.
+    """
+    ranked = sorted(range(len(chunks)), key=lambda i: -scores[i])
+    selected = []
+    total = 0
+    for i in ranked:
+        size = len(chunks[i][1])
+        if total + size > max_chars:
+            continue
+        selected.append(i)
+        total += size
+    return [chunks[i] for i in sorted(selected)]
+
+
+def format_chunks(chunks, n_omitted=0):
+    parts = []
+    last_page = None
+    for page_num, text in chunks:
+        if page_num != last_page:
+            parts.append(f"[Page {page_num}]")
+            last_page = page_num
+        parts.append(text)
+    if n_omitted:
+        parts.append(f"... [{n_omitted} less relevant passages of the PDF omitted]")
+    return "\n\n".join(parts)
+
+
+def get_pdf_context(pdf_path, query=None, max_tokens=DEFAULT_CONTEXT_TOKENS, top_k=None, max_workers=None):
+    """
+    Extract the text of a PDF to use as context, keeping it within a token budget.
+
+    With a query, only the passages the document's BM25 index ranks as most
+    relevant are kept. Without one, passages are kept from the beginning of
+    the document until the budget is used up.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        query (str, optional): What the context will be used for.
+        max_tokens (int): Approximate token budget for the context.
+        top_k (int, optional): Maximum number of passages to retrieve.
+        max_workers (int, optional): Processes used to parse large documents.
+
+    Returns:
+        str: The selected text, marked with page numbers.
+    """
+    index = get_pdf_index(pdf_path, max_workers)
+    chunks = index.chunks
+    scores = [0] * len(chunks)
+    if query:
+        matches = sorted(index.search(query, top_k or len(chunks)))
+        # Passages that didn't match the query at all are left out, unless
+        # nothing matched, in which case fall back to document order
+        if matches:
+            chunks = [index.chunks[i] for i, score in matches]
+            scores = [score for i, score in matches]
+    elif top_k:
+        chunks = chunks[:top_k]
+        scores = scores[:top_k]
+    selected = select_chunks(chunks, scores, max_tokens * CHARS_PER_TOKEN)
+    return format_chunks(selected, len(index.chunks) - len(selected))
@@ -0,0 +1,178 @@
+import ast
+from collections import namedtuple
+
+# A top-level class whose body has been fully received. program is the
+# source of everything up to and including the class, which is enough to
+# render it; error holds the SyntaxError found in that source, if any.
+CompletedClass = namedtuple("CompletedClass", ["name", "is_scene", "program", "error"])
+
+
+class StreamingProgramParser:
+    """
+    Consumes a program as it streams in from the LLM and reports each
+    top-level class as soon as its definition is complete, i.e. once the
+    next top-level statement starts.
+
+    Markdown code fences are dropped, as in postprocess_program.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self._partial_line = ""
+        # Line ranges of classes which failed to parse, left out of later
+        # programs so one bad class doesn't invalidate the rest
+        self._broken_ranges = []
+        self._class_start = None
+        self._class_name = None
+        self._class_is_scene = False
+        # Lines of a class statement which doesn't parse yet, e.g. one
+        # split across lines, or None once the class has been classified
+        self._header_lines = None
+        # The triple quote of a string left open by the lines so far, if any,
+        # and how many brackets they leave open
+        self._open_quote = None
+        self._bracket_depth = 0
+        self.scene_names = []
+
+    def feed(self, text):
+        """Add streamed text, returning the classes completed by it."""
+        completed = []
+        text = self._partial_line + text
+        *lines, self._partial_line = text.split("\n")
+        for line in lines:
+            completed.extend(self._add_line(line))
+        return completed
+
+    def finish(self):
+        """Flush the end of the stream, returning the final completed class, if any."""
+        completed = []
+        if self._partial_line:
+            completed.extend(self._add_line(self._partial_line))
+            self._partial_line = ""
+        if self._class_start is not None:
+            completed.append(self._complete_class())
+        return completed
+
+    def get_program(self):
+        return "\n".join(self.lines)
+
+    def _add_line(self, line):
+        in_string = self._open_quote is not None
+        if not in_string and line.lstrip().startswith("```"):
+            return []
+
+        # Lines within a string or brackets continue the statement before them,
+        # except for definitions, which can't, so a bracket left unclosed by
+        # a broken class doesn't swallow the classes after it
+        if not in_string and line.startswith(("class ", "def ")):
+            self._bracket_depth = 0
+        continues_statement = in_string or self._bracket_depth > 0
+        completed = []
+        if not continues_statement and self._starts_top_level_statement(line):
+            if self._class_start is not None:
+                completed.append(self._complete_class())
+            if line.startswith("class "):
+                self._begin_class(line)
+        elif self._header_lines is not None:
+            self._header_lines.append(line)
+            self._classify_class()
+        self.lines.append(line)
+        self._open_quote, self._bracket_depth = get_line_state(
+            line, self._open_quote, self._bracket_depth
+        )
+        return completed
+
+    def _starts_top_level_statement(self, line):
+        return bool(line) and not line[0].isspace() and not line.startswith(("#", ")", "]", "}"))
+
+    def _begin_class(self, line):
+        self._class_start = len(self.lines)
+        # Until the class statement parses, go by what the first line says
+        self._class_name = line[len("class "):].split("(")[0].split(":")[0].strip()
+        self._class_is_scene = False
+        self._header_lines = [line]
+        self._classify_class()
+
+    def _classify_class(self):
+        header = "\n".join(self._header_lines).rstrip()
+        try:
+            node = ast.parse(header + "\n    pass").body[0]
+        except SyntaxError:
+            # e.g. a class statement split across lines, tried again with the next line
+            return
+        self._header_lines = None
+        base_names = [ast.unparse(base).split(".")[-1] for base in node.bases]
+        self._class_name = node.name
+        self._class_is_scene = any(
+            name.endswith("Scene") or name in self.scene_names
+            for name in base_names
+        )
+
+    def _join_lines(self, end):
+        lines = self.lines[:end]
+        for start, stop in reversed(self._broken_ranges):
+            del lines[start:stop]
+        return "\n".join(lines) + "\n"
+
+    def _complete_class(self):
+        # Trailing blank lines belong to whatever comes next
+        end = len(self.lines)
+        while end > self._class_start and not self.lines[end - 1].strip():
+            end -= 1
+        program = self._join_lines(end)
+
+        error = None
+        try:
+            ast.parse(program)
+        except SyntaxError as e:
+            error = e
+            self._broken_ranges.append((self._class_start, end))
+
+        if self._class_is_scene and error is None:
+            self.scene_names.append(self._class_name)
+
+        result = CompletedClass(self._class_name, self._class_is_scene, program, error)
+        self._class_start = None
+        self._class_name = None
+        self._class_is_scene = False
+        self._header_lines = None
+        return result
+
+
+def get_line_state(line, quote=None, depth=0):
+    """
+    Given the triple quote of a string open at the start of the line, if any,
+    and the number of brackets open there, return the same at its end.
+    """
+    i = 0
+    while i < len(line):
+        if quote is not None:
+            if line[i] == "\\":
+                i += 2
+            elif line.startswith(quote, i):
+                i += 3
+                quote = None
+            else:
+                i += 1
+        elif line[i] == "#":
+            break
+        elif line[i] in "([{":
+            depth += 1
+            i += 1
+        elif line[i] in ")]}":
+            # Unmatched closing brackets are left for the parser to report
+            depth = max(depth - 1, 0)
+            i += 1
+        elif line[i] in "'\"":
+            if line.startswith(line[i] * 3, i):
+                quote = line[i] * 3
+                i += 3
+            else:
+                # A string within the line
+                end = i + 1
+                while end < len(line) and line[end] != line[i]:
+                    end += 2 if line[end] == "\\" else 1
+                i = end + 1
+        else:
+            i += 1
+    return quote, depth
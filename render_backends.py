@@ -0,0 +1,148 @@
+import os
+import platform
+from abc import ABC, abstractmethod
+import subprocess
+import sys
+
+# Root of this repository, which holds the vendored manimlib
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Run as `python -c LIMIT_RESOURCES address_space_bytes cpu_seconds command...`,
+# it applies the given limits, 0 meaning none, then replaces itself with
+# the command. Unlike preexec_fn, this is safe to launch from threads.
+LIMIT_RESOURCES = """
+import os, resource, sys
+address_space, cpu_seconds = int(sys.argv[1]), int(sys.argv[2])
+if address_space:
+    resource.setrlimit(resource.RLIMIT_AS, (address_space, address_space))
+if cpu_seconds:
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+os.execv(sys.argv[3], sys.argv[3:])
+"""
+
+
+class RenderError(Exception):
+    """Raised when rendering a scene fails. stderr holds the renderer's error output."""
+
+    def __init__(self, message, stderr=""):
+        super().__init__(message)
+        self.stderr = stderr
+
+
+class RenderBackend(ABC):
+    """
+    Renders one scene of a program to a video file. Subclasses decide where
+    and how; the render scheduler only relies on this interface.
+    """
+
+    # How many scenes the backend can render at once
+    size = 1
+
+    @abstractmethod
+    def render(self, code_path, scene_name, output_path):
+        pass
+
+    def close(self):
+        pass
+
+
+class SandboxBackend(RenderBackend):
+    """
+    Renders on sandboxes leased from a SandboxPool, either E2B sandboxes or
+    LocalSandbox stand-ins.
+
+    Args:
+        pool (SandboxPool): Pool the sandboxes are leased from.
+        render_scene (callable): render_scene(sbx, code_path, scene_name, output_path)
+            renders one scene on a sandbox and writes the MP4 to output_path.
+    """
+
+    def __init__(self, pool, render_scene):
+        self.pool = pool
+        self.render_scene = render_scene
+        self.size = pool.size
+
+    def render(self, code_path, scene_name, output_path):
+        with self.pool.leased() as sbx:
+            self.render_scene(sbx, code_path, scene_name, output_path)
+
+    def close(self):
+        self.pool.close()
+
+
+class ManimGLBackend(RenderBackend):
+    """
+    Renders with the manimlib vendored in this repository, in a subprocess
+    on this machine, so there is no upload or download involved. Programs
+    must be written for ManimGL, i.e. `from manimlib import *`.
+
+    Each render runs in its own process, with limits on its wall clock time
+    and CPU time, and optionally on its address space.
+
+    Args:
+        size (int): Number of scenes rendered at once.
+        timeout (float): Seconds after which a render is killed.
+        max_memory_mb (int, optional): Address space limit per render. Some
+            GL drivers reserve large amounts of address space up front, so
+            this can break rendering if set too low.
+        max_cpu_seconds (int, optional): CPU time limit per render, which
+            catches runaway constructs that would otherwise only hit the timeout.
+        extra_args (list of str): Further manimlib command line arguments,
+            e.g. ["--hd"] or ["-l"].
+    """
+
+    def __init__(self, size=1, timeout=600, max_memory_mb=None, max_cpu_seconds=600, extra_args=()):
+        self.size = size
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.max_cpu_seconds = max_cpu_seconds
+        self.extra_args = list(extra_args)
+
+    def with_args(self, *extra_args):
+        """Return a copy of this backend which passes further arguments to manimlib, e.g. "--draft"."""
+        return ManimGLBackend(
+            self.size, self.timeout, self.max_memory_mb, self.max_cpu_seconds,
+            [*self.extra_args, *extra_args],
+        )
+
+    def get_command(self, code_path, scene_name, output_path):
+        video_dir, file_name = os.path.split(os.path.abspath(output_path))
+        return [
+            sys.executable, "-m", "manimlib",
+            os.path.abspath(code_path), scene_name,
+            "--write_file",
+            "--quiet",
+            "--video_dir", video_dir,
+            "--file_name", os.path.splitext(file_name)[0],
+            *self.extra_args,
+        ]
+
+    def with_resource_limits(self, command):
+        """Wrap a command so that it runs under this backend's resource limits, where supported."""
+        if platform.system() == "Windows" or not (self.max_memory_mb or self.max_cpu_seconds):
+            return command
+        address_space = (self.max_memory_mb or 0) * 1024 * 1024
+        return [
+            sys.executable, "-c", LIMIT_RESOURCES,
+            str(address_space), str(self.max_cpu_seconds or 0),
+            *command,
+        ]
+
+    def render(self, code_path, scene_name, output_path):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_DIR, env.get("PYTHONPATH")]))
+        try:
+            process = subprocess.run(
+                self.with_resource_limits(self.get_command(code_path, scene_name, output_path)),
+                cwd=os.path.dirname(os.path.abspath(code_path)),
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired as e:
+            raise RenderError(f"Rendering {scene_name} timed out after {self.timeout}s", e.stderr or "")
+        if process.returncode != 0:
+            raise RenderError(f"Rendering {scene_name} failed with code {process.returncode}", process.stderr)
+        if not os.path.exists(output_path):
+            raise RenderError(f"Rendering {scene_name} produced no video", process.stderr)
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import threading
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Remembers which code each video in the output directory was rendered from
+RENDER_MANIFEST_NAME = "render_manifest.json"
+
+# Outcome of rendering one scene. On success, error is None and video_path
+# points at the downloaded MP4; on failure, video_path is None.
+RenderResult = namedtuple("RenderResult", ["scene_name", "video_path", "error"])
+
+
+class RenderScheduler:
+    """
+    Renders scenes concurrently on a render backend. Scenes can be
+    submitted one at a time, e.g. while the program
+    is still being generated. A failing scene is reported in its result
+    and does not stop the others.
+
+    A scene whose video was already rendered from identical code is not
+    rendered again.
+
+    Args:
+        backend (RenderBackend): Renders a single scene.
+        output_dir (str): Directory the MP4s are written to.
+        max_workers (int, optional): Renders in flight, defaults to the backend size.
+    """
+
+    def __init__(self, backend, output_dir, max_workers=None):
+        self.backend = backend
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers or backend.size))
+        self._futures = []
+
+        self._manifest_path = os.path.join(output_dir, RENDER_MANIFEST_NAME)
+        self._manifest_lock = threading.Lock()
+        try:
+            with open(self._manifest_path, "r") as file:
+                self._manifest = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._manifest = {}
+
+    def get_render_key(self, code_path, scene_name):
+        with open(code_path, "rb") as file:
+            code = file.read()
+        return hashlib.sha256(code + scene_name.encode("utf-8")).hexdigest()
+
+    def _is_rendered(self, output_path, key):
+        with self._manifest_lock:
+            return self._manifest.get(output_path) == key and os.path.exists(output_path)
+
+    def _record_render(self, output_path, key):
+        with self._manifest_lock:
+            self._manifest[output_path] = key
+            with open(self._manifest_path, "w") as file:
+                json.dump(self._manifest, file, indent=2)
+
+    def _render(self, code_path, scene_name):
+        output_path = os.path.join(self.output_dir, f"{scene_name}.mp4")
+        try:
+            key = self.get_render_key(code_path, scene_name)
+            if self._is_rendered(output_path, key):
+                print(f"Scene {scene_name} is unchanged, reusing {output_path}")
+                return RenderResult(scene_name, output_path, None)
+            self.backend.render(code_path, scene_name, output_path)
+        except Exception as e:
+            # Render and sandbox command errors carry the output of the failed render,
+            # which is what's useful for repairing the code
+            error = getattr(e, "stderr", None) or traceback.format_exc()
+            return RenderResult(scene_name, None, error)
+        self._record_render(output_path, key)
+        return RenderResult(scene_name, output_path, None)
+
+    def submit(self, code_path, scene_name):
+        """Queue a scene for rendering, returning a future holding its RenderResult."""
+        future = self._executor.submit(self._render, code_path, scene_name)
+        self._futures.append(future)
+        return future
+
+    def results(self):
+        """
+        Yield a RenderResult for every scene submitted since the last call,
+        in order of completion.
+        """
+        futures, self._futures = self._futures, []
+        for future in as_completed(futures):
+            yield future.result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+def render_scenes(backend, code_path, scene_names, output_dir, max_workers=None):
+    """
+    Render several scenes of one program concurrently, yielding results
+    as soon as each scene finishes.
+
+    Args:
+        backend (RenderBackend): Renders a single scene.
+        code_path (str): Path to the program holding the scenes.
+        scene_names (list of str): Scenes to render.
+        output_dir (str): Directory the MP4s are written to.
+        max_workers (int, optional): Renders in flight, defaults to the backend size.
+
+    Yields:
+        RenderResult: One per scene, in order of completion.
+    """
+    with RenderScheduler(backend, output_dir, max_workers) as scheduler:
+        for scene_name in scene_names:
+            scheduler.submit(code_path, scene_name)
+        yield from scheduler.results()
@@ -0,0 +1,215 @@
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Home directory inside an E2B sandbox; code is uploaded and rendered here
+SANDBOX_HOME = "/home/user"
+
+
+class LocalCommandError(Exception):
+    """Raised when a LocalSandbox command exits with a non-zero status,
+    mirroring the exception E2B raises in the same situation."""
+
+    def __init__(self, stdout, stderr, exit_code):
+        super().__init__(f"Command exited with code {exit_code}: {stderr}")
+        self.stdout = stdout
+        self.stderr = stderr
+        self.exit_code = exit_code
+
+
+class LocalCommandResult:
+    def __init__(self, stdout, stderr, exit_code):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.exit_code = exit_code
+
+
+class LocalSandbox:
+    """
+    Offline stand-in for an E2B Sandbox. Commands run as local subprocesses,
+    and paths under /home/user are mapped into a private temporary directory,
+    so the same calls work against either implementation.
+    """
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix="local_sandbox_")
+        self.commands = _LocalCommands(self)
+        self.files = _LocalFiles(self)
+
+    def local_path(self, path):
+        if path.startswith(SANDBOX_HOME):
+            path = path[len(SANDBOX_HOME):].lstrip("/")
+        return os.path.join(self.root, path)
+
+    def is_running(self):
+        return os.path.isdir(self.root)
+
+    def kill(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class _LocalCommands:
+    def __init__(self, sandbox):
+        self.sandbox = sandbox
+
+    def run(self, cmd, timeout=60):
+        cmd = cmd.replace(SANDBOX_HOME, self.sandbox.root)
+        process = subprocess.run(
+            cmd,
+            shell=True,
+            cwd=self.sandbox.root,
+            capture_output=True,
+            text=True,
+            timeout=timeout or None,
+        )
+        if process.returncode != 0:
+            raise LocalCommandError(process.stdout, process.stderr, process.returncode)
+        return LocalCommandResult(process.stdout, process.stderr, process.returncode)
+
+
+class _LocalFiles:
+    def __init__(self, sandbox):
+        self.sandbox = sandbox
+
+    def write(self, path, data):
+        path = self.sandbox.local_path(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if hasattr(data, "read"):
+            data = data.read()
+        mode = "wb" if isinstance(data, bytes) else "w"
+        with open(path, mode) as file:
+            file.write(data)
+
+    def read(self, path, format="text"):
+        path = self.sandbox.local_path(path)
+        if format == "bytes":
+            with open(path, "rb") as file:
+                return bytearray(file.read())
+        with open(path, "r") as file:
+            return file.read()
+
+
+class SandboxPool:
+    """
+    Keeps a number of provisioned sandboxes warm and leases them out to
+    render jobs.
+
+    Sandboxes are health-checked when leased and replaced if they no
+    longer respond. After max_renders_per_sandbox renders a sandbox is
+    killed and a fresh one is provisioned in the background.
+
+    Args:
+        factory (callable): Creates a ready to use sandbox, e.g. initialize_box
+            or LocalSandbox.
+        size (int): Number of sandboxes kept warm.
+        max_renders_per_sandbox (int): Renders after which a sandbox is recycled.
+    """
+
+    def __init__(self, factory, size=2, max_renders_per_sandbox=20):
+        self.factory = factory
+        self.size = size
+        self.max_renders_per_sandbox = max_renders_per_sandbox
+
+        self._idle = queue.Queue()
+        self._render_counts = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=size)
+        self._closed = False
+
+    def start(self):
+        """Begin provisioning every sandbox in the background, and return immediately."""
+        for _ in range(self.size):
+            self._provision_async()
+        return self
+
+    def _provision_async(self):
+        self._executor.submit(self._provision)
+
+    def _provision(self):
+        try:
+            sbx = self.factory()
+        except Exception as e:
+            # Hand the error to whoever leases next, rather than retrying forever
+            print(f"Failed to provision sandbox: {e}")
+            self._idle.put(e)
+            return
+        if self._closed:
+            self._kill(sbx)
+            return
+        with self._lock:
+            self._render_counts[id(sbx)] = 0
+        self._idle.put(sbx)
+
+    def _kill(self, sbx):
+        with self._lock:
+            self._render_counts.pop(id(sbx), None)
+        try:
+            sbx.kill()
+        except Exception as e:
+            print(f"Failed to kill sandbox: {e}")
+
+    def _recycle(self, sbx):
+        self._kill(sbx)
+        if not self._closed:
+            self._provision_async()
+
+    def is_healthy(self, sbx):
+        try:
+            result = sbx.commands.run("echo ok", timeout=10)
+            return result.stdout.strip() == "ok"
+        except Exception:
+            return False
+
+    def lease(self, timeout=None):
+        """
+        Block until a healthy sandbox is available and return it. It must be
+        handed back with release.
+        """
+        while True:
+            sbx = self._idle.get(timeout=timeout)
+            if isinstance(sbx, Exception):
+                # Try again for the next lease
+                if not self._closed:
+                    self._provision_async()
+                raise sbx
+            if self.is_healthy(sbx):
+                return sbx
+            print("Sandbox failed health check, replacing it.")
+            self._recycle(sbx)
+
+    def release(self, sbx):
+        """Return a leased sandbox after a render, recycling it if it is worn out."""
+        with self._lock:
+            self._render_counts[id(sbx)] = self._render_counts.get(id(sbx), 0) + 1
+            worn_out = self._render_counts[id(sbx)] >= self.max_renders_per_sandbox
+        if worn_out or self._closed:
+            self._recycle(sbx)
+        else:
+            self._idle.put(sbx)
+
+    @contextmanager
+    def leased(self, timeout=None):
+        sbx = self.lease(timeout)
+        try:
+            yield sbx
+        finally:
+            self.release(sbx)
+
+    def close(self):
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        while not self._idle.empty():
+            sbx = self._idle.get()
+            if not isinstance(sbx, Exception):
+                self._kill(sbx)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
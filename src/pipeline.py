@@ -1,13 +1,69 @@
 import anthropic
+import argparse
 import base64
 import json
 import os
+import random
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# The LLM response cache and PDF index live at the root of the repository,
+# so this runs from there, as `python -m src.pipeline`
+from llm_cache import cached_completion
+from pdf_context import DEFAULT_CONTEXT_TOKENS, get_pdf_context
 
 client = anthropic.Anthropic(
     api_key=os.environ.get("ANTHROPIC_API_KEY"),
 )
 
+# How many sections are planned and generated at the same time
+MAX_CONCURRENT_SECTIONS = 4
+# Retry policy for rate-limited / overloaded API calls
+MAX_RETRIES = 5
+BASE_RETRY_DELAY = 2.0
+MAX_RETRY_DELAY = 60.0
+
+
+def is_retryable_error(error):
+    """Rate limits (429) and overloaded servers (529) are worth retrying."""
+    if isinstance(error, anthropic.RateLimitError):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in (429, 529)
+    return False
+
+
+def call_with_backoff(func, *args, max_retries=MAX_RETRIES, **kwargs):
+    """
+    Call func(*args, **kwargs), retrying with exponential backoff and jitter
+    whenever the API reports a rate limit or overload.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_retries or not is_retryable_error(e):
+                raise
+            delay = min(MAX_RETRY_DELAY, BASE_RETRY_DELAY * 2 ** attempt)
+            delay *= random.uniform(0.5, 1.0)
+            print(f"  Rate limited ({type(e).__name__}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+def create_message(use_cache=True, refresh_cache=False, **kwargs):
+    """
+    Return the response text of a messages.create call. Identical requests
+    (same model, prompt and PDF bytes) are served from disk, unless use_cache
+    is False, and refresh_cache calls the API again, overwriting the cache.
+    """
+    return cached_completion(
+        lambda **request: call_with_backoff(client.messages.create, **request),
+        use_cache=use_cache,
+        refresh=refresh_cache,
+        **kwargs,
+    )
+
 def extract_json_from_text(text):
     # Look for content between ```json and ``` markers
     pattern = r'```json\s*(.*?)\s*```'
@@ -19,26 +75,43 @@ def extract_json_from_text(text):
     else:
         return None
 
-def extract_content_from_pdf(pdf_path):
-    """Stage 1: Extract content from PDF and divide into logical sections."""
-    with open(pdf_path, "rb") as f:
-        pdf_data = base64.b64encode(f.read()).decode("utf-8")
+def extract_content_from_pdf(pdf_path, query=None, max_context_tokens=DEFAULT_CONTEXT_TOKENS,
+                             use_cache=True, refresh_cache=False):
+    """
+    Stage 1: Extract content from PDF and divide into logical sections.
+
+    Without a query the whole PDF is sent to the model. With one, only the
+    passages of its text most relevant to the query are sent, which keeps
+    prompts small for long documents.
+    """
+    if query:
+        pdf_text = get_pdf_context(pdf_path, query=query, max_tokens=max_context_tokens)
+        document = {
+            "type": "text",
+            "text": f"Passages of the PDF relevant to: {query}\n\n{pdf_text}",
+        }
+    else:
+        with open(pdf_path, "rb") as f:
+            pdf_data = base64.b64encode(f.read()).decode("utf-8")
+        document = {
+            "type": "document",
+            "source": {
+                "type": "base64",
+                "media_type": "application/pdf",
+                "data": pdf_data
+            }
+        }
 
-    response = client.messages.create(
+    content = create_message(
+        use_cache=use_cache,
+        refresh_cache=refresh_cache,
         model="claude-3-7-sonnet-latest",
         max_tokens=4000,
         messages=[
             {
                 "role": "user",
                 "content": [
-                    {
-                        "type": "document",
-                        "source": {
-                            "type": "base64",
-                            "media_type": "application/pdf",
-                            "data": pdf_data
-                        }
-                    },
+                    document,
                     {
                         "type": "text",
                         "text": "Analyze the content of this PDF. Identify logical sections based on topics or chapters. Extract each section's main concepts, formulas, and examples. Create a JSON structure with the following format: '''json {\"sections\": [{\"id\": \"unique_id\", \"title\": \"section_title\", \"concepts\": [...], \"formulas\": [{\"description\": \"...\", \"latex\": \"...\"}], \"examples\": [...]}]}. Make sure all formulas are correctly represented in LaTeX."
@@ -49,7 +122,6 @@ def extract_content_from_pdf(pdf_path):
     )
 
     # Extract JSON from response
-    content = response.content[0].text
     try:
 
         structured_content = extract_json_from_text(content)
@@ -58,11 +130,13 @@ def extract_content_from_pdf(pdf_path):
         return {"error": "Error parsing JSON", "raw_content": content}
 
 
-def plan_animation_for_section(section):
+def plan_animation_for_section(section, use_cache=True, refresh_cache=False):
     """Stage 2: Plan animation for a single section."""
     section_json = json.dumps(section)
 
-    response = client.messages.create(
+    content = create_message(
+        use_cache=use_cache,
+        refresh_cache=refresh_cache,
         model="claude-3-7-sonnet-latest",
         max_tokens=4000,
         messages=[
@@ -105,7 +179,6 @@ def plan_animation_for_section(section):
 
     # Extract JSON from response
 
-    content = response.content[0].text
     try:
 
         structured_content = extract_json_from_text(content)
@@ -115,11 +188,13 @@ def plan_animation_for_section(section):
         return {"error": "Error parsing JSON", "raw_content": content}
 
 
-def generate_manim_code_for_section(animation_plan):
+def generate_manim_code_for_section(animation_plan, use_cache=True, refresh_cache=False):
     """Stage 3: Generate Manim code for a single section."""
     plan_json = json.dumps(animation_plan)
 
-    response = client.messages.create(
+    content = create_message(
+        use_cache=use_cache,
+        refresh_cache=refresh_cache,
         model="claude-3-7-sonnet-latest",
         max_tokens=8192,
         messages=[
@@ -155,7 +230,7 @@ def generate_manim_code_for_section(animation_plan):
     )
 
     # Extract code blocks
-    manim_code = response.content[0].text
+    manim_code = content
     code_blocks = re.findall(r'```python(.*?)```', manim_code, re.DOTALL)
     if code_blocks:
         return "\n".join(code_blocks).strip()
@@ -206,12 +281,22 @@ def merge_manim_code(code_sections):
     return combined_code
 
 
-def pdf_to_manim_sections(pdf_path, output_dir):
-    """Complete pipeline from PDF to multiple Manim code files, one per section."""
+def pdf_to_manim_sections(pdf_path, output_dir, max_workers=MAX_CONCURRENT_SECTIONS, query=None,
+                          use_cache=True, refresh_cache=False):
+    """
+    Complete pipeline from PDF to multiple Manim code files, one per section.
+
+    Sections are planned and generated concurrently, with at most
+    max_workers sections in flight at once. Pass max_workers=1 to
+    process them one at a time. If a query is given, only the parts of
+    the PDF relevant to it are sent to the model. use_cache=False bypasses
+    the LLM response cache, and refresh_cache=True overwrites it.
+    """
     os.makedirs(output_dir, exist_ok=True)
+    cache_kwargs = dict(use_cache=use_cache, refresh_cache=refresh_cache)
 
     print("Stage 1: Extracting content and dividing into sections...")
-    structured_content = extract_content_from_pdf(pdf_path)
+    structured_content = extract_content_from_pdf(pdf_path, query=query, **cache_kwargs)
 
     if "error" in structured_content:
         print(f"Error in content extraction: {structured_content}")
@@ -225,31 +310,37 @@ def pdf_to_manim_sections(pdf_path, output_dir):
 
     print(f"Found {len(sections)} sections.")
 
-    animation_plans = []
-    code_sections = []
-
-    for i, section in enumerate(sections):
-        section_id = section.get("id", f"section_{i + 1}")
+    def process_section(i, section):
         section_title = section.get("title", f"Section {i + 1}")
         clean_title = re.sub(r'[^\w]', '_', section_title).lower()
+        prefix = f"[{i + 1}/{len(sections)}]"
 
-        print(f"Processing section {i + 1}/{len(sections)}: {section_title}")
+        print(f"{prefix} Processing section: {section_title}")
 
         # Stage 2: Plan animation for this section
-        print(f"  Planning animation...")
-        animation_plan = plan_animation_for_section(section)
-        animation_plans.append(animation_plan)
+        print(f"{prefix}   Planning animation...")
+        animation_plan = plan_animation_for_section(section, **cache_kwargs)
 
         # Stage 3: Generate Manim code for this section
-        print(f"  Generating Manim code...")
-        manim_code = generate_manim_code_for_section(animation_plan)
-        code_sections.append(manim_code)
+        print(f"{prefix}   Generating Manim code...")
+        manim_code = generate_manim_code_for_section(animation_plan, **cache_kwargs)
 
         # Save individual section code
         with open(f"{output_dir}/{clean_title}.py", "w", encoding="utf-8") as f:
             f.write(manim_code)
 
-        print(f"  Saved to {output_dir}/{clean_title}.py")
+        print(f"{prefix}   Saved to {output_dir}/{clean_title}.py")
+        return animation_plan, manim_code
+
+    # Each section's plan -> code chain is independent of the others, so run
+    # the chains concurrently. map() yields results in submission order, which
+    # keeps the outputs aligned with the sections.
+    n_workers = max(1, min(max_workers, len(sections)))
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(process_section, range(len(sections)), sections))
+
+    animation_plans = [plan for plan, code in results]
+    code_sections = [code for plan, code in results]
 
     # Save combined results
     with open(f"{output_dir}/all_sections.json", "w", encoding="utf-8") as f:
@@ -267,6 +358,22 @@ def pdf_to_manim_sections(pdf_path, output_dir):
     print(f"Combined animation saved to {output_dir}/combined_animation.py")
 
 
-# Usage example
+# Usage example, run from the root of the repository:
+#   python -m src.pipeline statistics_formulas.pdf output/statistics_animations
 if __name__ == "__main__":
-    pdf_to_manim_sections("statistics_formulas.pdf", "output/statistics_animations")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate Manim code for each section of a PDF")
+    parser.add_argument("pdf_path", nargs="?", default="statistics_formulas.pdf", help="PDF to animate")
+    parser.add_argument("output_dir", nargs="?", default="output/statistics_animations", help="Directory for the generated code")
+    parser.add_argument("--query", help="Only send the parts of the PDF relevant to this query")
+    parser.add_argument("--max-workers", type=int, default=MAX_CONCURRENT_SECTIONS, help="How many sections are processed at once")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM, bypassing the response cache")
+    parser.add_argument("--refresh-cache", action="store_true", help="Call the LLM and overwrite any cached response")
+    args = parser.parse_args()
+
+    pdf_to_manim_sections(
+        args.pdf_path, args.output_dir,
+        max_workers=args.max_workers,
+        query=args.query,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh_cache,
+    )
\ No newline at end of file
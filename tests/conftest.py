@@ -0,0 +1,46 @@
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+# Appended rather than prepended, as code.py at the root would shadow the
+# standard library's code module, which pdb imports
+sys.path.append(str(REPO_DIR))
+
+
+@pytest.fixture
+def render_scene(tmp_path):
+    """
+    Returns render(code, scene_name, *args), which writes the code to a file
+    and renders the scene with the vendored manimlib, with the given extra
+    arguments. Videos go under tmp_path / "videos".
+    """
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg is not installed")
+    pytest.importorskip("moderngl")
+
+    code_path = tmp_path / "scene.py"
+    video_dir = tmp_path / "videos"
+
+    def render(code, scene_name, *args):
+        code_path.write_text(code)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_DIR), env.get("PYTHONPATH")]))
+        subprocess.run(
+            [
+                sys.executable, "-m", "manimlib", str(code_path), scene_name,
+                "--write_file", "--quiet", "--low_quality",
+                "--video_dir", str(video_dir),
+                *args,
+            ],
+            cwd=tmp_path,
+            env=env,
+            check=True,
+        )
+        return video_dir
+
+    return render
@@ -0,0 +1,35 @@
+SCENE = '''
+from manimlib import *
+
+
+class CachedScene(Scene):
+    def construct(self):
+        square = Square()
+        self.play(ShowCreation(square))
+        self.play(Transform(square, Circle()))
+        self.play(square.animate.shift(RIGHT).set_color(RED))
+        self.play(FadeIn(Dot(LEFT)))
+        self.wait()
+'''
+
+
+def get_cached_movies(video_dir):
+    return {path.name for path in video_dir.rglob("partial_movie_cache/*")}
+
+
+def test_identical_run_reuses_every_animation(render_scene):
+    video_dir = render_scene(SCENE, "CachedScene", "--cache_animations")
+    first_run = get_cached_movies(video_dir)
+    assert first_run
+
+    render_scene(SCENE, "CachedScene", "--cache_animations")
+    # Any animation missing the cache would have added a movie under a new key
+    assert get_cached_movies(video_dir) == first_run
+
+
+def test_changed_animation_misses_the_cache(render_scene):
+    video_dir = render_scene(SCENE, "CachedScene", "--cache_animations")
+    first_run = get_cached_movies(video_dir)
+
+    render_scene(SCENE.replace("RIGHT", "LEFT"), "CachedScene", "--cache_animations")
+    assert len(get_cached_movies(video_dir) - first_run) > 0
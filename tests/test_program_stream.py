@@ -0,0 +1,97 @@
+from program_stream import StreamingProgramParser
+
+
+def stream(program, chunk_size=7):
+    parser = StreamingProgramParser()
+    completed = []
+    for i in range(0, len(program), chunk_size):
+        completed.extend(parser.feed(program[i:i + chunk_size]))
+    completed.extend(parser.finish())
+    return completed
+
+
+def summarize(completed):
+    return [(c.name, c.is_scene, c.error is None) for c in completed]
+
+
+def test_classes_are_reported_as_they_complete():
+    program = (
+        "from manimlib import *\n"
+        "\n"
+        "class First(Scene):\n"
+        "    def construct(self):\n"
+        "        self.wait()\n"
+        "\n"
+        "class Helper(VGroup):\n"
+        "    pass\n"
+        "\n"
+        "class Second(First):\n"
+        "    pass\n"
+    )
+    assert summarize(stream(program)) == [
+        ("First", True, True),
+        ("Helper", False, True),
+        ("Second", True, True),
+    ]
+
+
+def test_class_header_split_across_lines():
+    program = (
+        "class First(\n"
+        "    Scene,\n"
+        "):\n"
+        "    def construct(self):\n"
+        "        self.wait()\n"
+    )
+    assert summarize(stream(program)) == [("First", True, True)]
+
+
+def test_unindented_line_in_triple_quoted_string():
+    program = (
+        "class First(Scene):\n"
+        "    def construct(self):\n"
+        "        text = '''\n"
+        "class NotAClass(Scene):\n"
+        "'''\n"
+        "\n"
+        "class Second(Scene):\n"
+        "    pass\n"
+    )
+    assert summarize(stream(program)) == [
+        ("First", True, True),
+        ("Second", True, True),
+    ]
+
+
+def test_unindented_line_within_brackets():
+    program = (
+        "class First(Scene):\n"
+        "    def construct(self):\n"
+        "        x = (1 +\n"
+        "2)\n"
+        "        self.wait(x)\n"
+        "\n"
+        "class Second(Scene):\n"
+        "    pass\n"
+    )
+    completed = stream(program)
+    assert summarize(completed) == [
+        ("First", True, True),
+        ("Second", True, True),
+    ]
+    assert "2)" in completed[-1].program
+
+
+def test_broken_class_does_not_break_later_classes():
+    program = (
+        "class First(Scene):\n"
+        "    def construct(self):\n"
+        "        x = (1 +\n"
+        "\n"
+        "class Second(Scene):\n"
+        "    pass\n"
+    )
+    assert summarize(stream(program)) == [
+        ("First", True, False),
+        ("Second", True, True),
+    ]
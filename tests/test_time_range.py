@@ -0,0 +1,42 @@
+import shutil
+import subprocess
+
+import pytest
+
+SCENE = '''
+from manimlib import *
+
+
+class TimeRange(Scene):
+    def construct(self):
+        square = Square()
+        self.play(ShowCreation(square), run_time=1)
+        self.play(square.animate.shift(RIGHT), run_time=1)
+        self.wait(2)
+'''
+
+
+def count_frames(movie_path):
+    if shutil.which("ffprobe") is None:
+        pytest.skip("ffprobe is not installed")
+    output = subprocess.run(
+        [
+            "ffprobe", "-v", "error", "-count_frames",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=nb_read_frames",
+            "-of", "csv=p=0",
+            str(movie_path),
+        ],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return int(output.strip())
+
+
+@pytest.mark.parametrize("from_time, to_time", [(1, 3), (0.5, 2.5), (0, 4)])
+def test_frames_cover_half_open_time_range(render_scene, from_time, to_time):
+    video_dir = render_scene(
+        SCENE, "TimeRange", "--fps", "30",
+        "--from-time", str(from_time), "--to-time", str(to_time),
+    )
+    movie_path = next(video_dir.rglob("TimeRange.mp4"))
+    assert count_frames(movie_path) == round(30 * (to_time - from_time))